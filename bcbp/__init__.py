@@ -1,5 +1,53 @@
+from importlib import import_module
+
 from .encode import encode
+from .patch import patch
+from .validate import ErrorCode, Validation, is_valid, validate
 from .decode import decode
+from .diagnostics import Diagnostic, DiagnosticReport, decode_checked
+from .batch import DecodeResult, decode_many
+from .cache import CacheStats, DecodeCache
+from .instrument import Instrumentation
+from .index import IndexEntry, PassIndex
+from .signature import (
+    HMACBackend,
+    SignatureVerifier,
+    Status,
+    Verification,
+    VerifierStats,
+)
+from .binary import RecordFile, write_records
+from .serialize import from_dict, from_json, read_jsonl, to_dict, to_json, write_jsonl
+from .lazy import LazyBoardingPass, decode_lazy
+from .projection import Projection
+from .scanlog import iter_records, read_scan_log
+from .reconcile import Reconciliation, reconcile
 from .models import BarcodedBoardingPass, BoardingPassData, BoardingPassMetaData, Leg
+from .models import (
+    CompactBarcodedBoardingPass,
+    CompactBoardingPassData,
+    CompactBoardingPassMetaData,
+    CompactLeg,
+    from_compact,
+    to_compact,
+)
+
+# loaded on first use: they import numpy and asyncio
+_LAZY = {
+    "decode_columns": "columns",
+    "encode_columns": "columns",
+    "decode_stream": "stream",
+    "read_frames": "stream",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['encode', 'decode', 'BarcodedBoardingPass', 'BoardingPassData', 'BoardingPassMetaData', 'Leg']
\ No newline at end of file
+__all__ = ['encode', 'patch', 'decode', 'decode_checked', 'Diagnostic', 'DiagnosticReport', 'is_valid', 'validate', 'Validation', 'ErrorCode', 'decode_many', 'DecodeResult', 'DecodeCache', 'CacheStats', 'Instrumentation', 'PassIndex', 'IndexEntry', 'SignatureVerifier', 'Verification', 'Status', 'VerifierStats', 'HMACBackend', 'RecordFile', 'write_records', 'to_dict', 'to_json', 'from_dict', 'from_json', 'write_jsonl', 'read_jsonl', 'decode_columns', 'encode_columns', 'decode_lazy', 'LazyBoardingPass', 'Projection', 'read_scan_log', 'iter_records', 'reconcile', 'Reconciliation', 'decode_stream', 'read_frames', 'BarcodedBoardingPass', 'BoardingPassData', 'BoardingPassMetaData', 'Leg', 'CompactBarcodedBoardingPass', 'CompactBoardingPassData', 'CompactBoardingPassMetaData', 'CompactLeg', 'to_compact', 'from_compact']
\ No newline at end of file
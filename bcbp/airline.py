@@ -0,0 +1,119 @@
+"""Per-carrier layouts for the for_individual_airline_use remainder.
+
+    register("LH", FixedWidth((("fare_class", 1), ("tier", 3), ("meal", 4))))
+    register("BA", Delimited(("tier", "lounge", "note"), "/"))
+    decode(barcode).data.legs[0].airline_use  # -> AirlineUse(tier=..., ...)
+
+Each layout is compiled once into a flat parser function returning a named
+tuple, and carriers sharing a layout share the parser. Leg.airline_use looks
+the parser up by operating carrier designator only when read, so decode does
+no extra work and unregistered carriers cost a dict miss.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Tuple, Union
+
+from .models import AIRLINE_PARSERS
+
+
+class FixedWidth(NamedTuple):
+    """Fields of fixed width, as (name, width) pairs in order."""
+
+    fields: Tuple[Tuple[str, int], ...]
+    name: str = "AirlineUse"
+
+
+class Delimited(NamedTuple):
+    """Fields separated by delimiter; the last one takes any remaining text."""
+
+    names: Tuple[str, ...]
+    delimiter: str = "/"
+    name: str = "AirlineUse"
+
+
+Layout = Union[FixedWidth, Delimited]
+
+
+def _compile_fixed_width(layout: FixedWidth, record) -> Callable[[str], Tuple]:
+    lines = ["def parse(s):", "    return _record("]
+    start = 0
+    for _, width in layout.fields:
+        if width <= 0:
+            raise ValueError(f"field width must be positive, got {width}")
+        lines.append(f"        s[{start}:{start + width}].rstrip() or None,")
+        start += width
+    lines.append("    )")
+    namespace = {"_record": record}
+    exec("\n".join(lines), namespace)
+    return namespace["parse"]
+
+
+def _compile_delimited(layout: Delimited, record) -> Callable[[str], Tuple]:
+    if not layout.delimiter:
+        raise ValueError("delimiter must not be empty")
+    count = len(layout.names)
+    lines = [
+        "def parse(s):",
+        # padded so missing trailing fields read as empty
+        f"    p = s.split(_delimiter, {count - 1}) + _padding",
+        "    return _record(",
+    ]
+    lines += [f"        p[{index}].strip() or None," for index in range(count)]
+    lines.append("    )")
+    namespace = {
+        "_record": record,
+        "_delimiter": layout.delimiter,
+        "_padding": [""] * count,
+    }
+    exec("\n".join(lines), namespace)
+    return namespace["parse"]
+
+
+@lru_cache(maxsize=None)
+def compile_layout(layout: Layout) -> Callable[[str], Tuple]:
+    """Compile a layout into a parser from the remainder string to a named tuple.
+
+    Results are cached per layout, so registering one layout for several
+    carriers compiles it once.
+    """
+    if isinstance(layout, FixedWidth):
+        names = [name for name, _ in layout.fields]
+    else:
+        names = list(layout.names)
+    if not names:
+        raise ValueError("layout has no fields")
+    record = namedtuple(layout.name, names)
+    if isinstance(layout, FixedWidth):
+        return _compile_fixed_width(layout, record)
+    return _compile_delimited(layout, record)
+
+
+def _normalized(layout: Layout) -> Layout:
+    # lists are accepted for convenience but the compile cache needs tuples
+    if isinstance(layout, FixedWidth):
+        return layout._replace(fields=tuple(tuple(field) for field in layout.fields))
+    if isinstance(layout, Delimited):
+        return layout._replace(names=tuple(layout.names))
+    raise TypeError(f"expected FixedWidth or Delimited, got {type(layout).__name__}")
+
+
+def register(carrier: str, layout: Layout) -> Callable[[str], Tuple]:
+    """Parse the airline use data of legs operated by carrier with layout.
+
+    Replaces any layout registered for the carrier before. Returns the
+    compiled parser.
+    """
+    parse = compile_layout(_normalized(layout))
+    # decoded designators are right-trimmed, e.g. "LH" from "LH "
+    AIRLINE_PARSERS[carrier.rstrip()] = parse
+    return parse
+
+
+def unregister(carrier: str) -> None:
+    """Forget the layout of carrier, if any."""
+    AIRLINE_PARSERS.pop(carrier.rstrip(), None)
+
+
+def registered() -> Dict[str, Callable[[str], Tuple]]:
+    """Return a copy of the {carrier: parser} registry."""
+    return dict(AIRLINE_PARSERS)
@@ -0,0 +1,98 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from .decode import decode
+from .models import BarcodedBoardingPass
+from .utils import current_year
+
+
+class DecodeResult(NamedTuple):
+    index: int
+    bcbp: Optional[BarcodedBoardingPass] = None
+    error: Optional[Exception] = None
+
+
+def _decode_chunk(
+    start: int, barcodes: List[str], reference_year: Optional[int]
+) -> List[DecodeResult]:
+    """Decode a chunk of barcodes, capturing per-row errors."""
+    results = []
+    for index, barcode in enumerate(barcodes, start):
+        try:
+            results.append(DecodeResult(index, decode(barcode, reference_year)))
+        except Exception as error:
+            results.append(DecodeResult(index, error=error))
+    return results
+
+
+def _chunks(barcodes: Iterator[str], chunksize: int):
+    start = 0
+    while True:
+        chunk = list(islice(barcodes, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def decode_many(
+    barcodes: Iterable[str],
+    reference_year: Optional[int] = None,
+    workers: int = 1,
+    chunksize: int = 1024,
+    ordered: bool = True,
+) -> Iterator[DecodeResult]:
+    """Decode many BCBP barcode strings, yielding one DecodeResult per input.
+
+    With more than one worker, barcodes are sent to a process pool in chunks of
+    chunksize. Inputs that fit in a single chunk are decoded in-process. Rows
+    that fail to decode are yielded with their error instead of raising. When
+    ordered is False, chunks are yielded as soon as they finish.
+    """
+    if reference_year is None:
+        # resolve once so every row and worker uses the same year
+        reference_year = current_year()
+    chunks = _chunks(iter(barcodes), chunksize)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None) if workers > 1 else None
+
+    if second is None:
+        # small input or single worker: not worth starting a pool
+        yield from _decode_chunk(*first, reference_year)
+        for start, chunk in chunks:
+            yield from _decode_chunk(start, chunk, reference_year)
+        return
+
+    # imported here as it pulls in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit(chunk):
+            pending.append(executor.submit(_decode_chunk, *chunk, reference_year))
+
+        submit(first)
+        submit(second)
+        # keep a bounded number of chunks in flight so memory stays flat
+        max_pending = workers * 2
+        exhausted = False
+        while pending:
+            while not exhausted and len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    submit(chunk)
+
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
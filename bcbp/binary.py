@@ -0,0 +1,314 @@
+"""Compact binary records for decoded boarding passes.
+
+A record is a fixed-width pass block, one fixed-width block per leg and the
+legs' variable-length individual airline use data. Every block starts with a
+null bitmap; strings take their LENGTHS width (NUL padded, latin-1), numbers
+and flags one byte and dates two bytes counting days since 1970-01-01 UTC.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import fields as dataclass_fields
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import layout
+from .models import (
+    LENGTHS,
+    MODELS,
+    BarcodedBoardingPass,
+    BoardingPassData,
+    BoardingPassMetaData,
+    Leg,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_REMAINDER = "for_individual_airline_use"
+
+# record flags
+_HAS_DATA = 1
+_HAS_META = 2
+_HAS_LEGS = 4
+
+
+def _pack_string(width: int):
+    def pack(value):
+        encoded = value.encode("latin-1")
+        if len(encoded) > width or b"\0" in encoded:
+            raise ValueError(f"{value!r} does not fit a {width} byte field")
+        return encoded
+
+    return pack
+
+
+def _unpack_string(value: bytes) -> str:
+    return value.rstrip(b"\0").decode("latin-1")
+
+
+def _pack_date(value: datetime) -> int:
+    if value.utcoffset() != timedelta(0) or value != value.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ):
+        raise ValueError(f"{value!r} is not a UTC date")
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _unpack_date(value: int) -> datetime:
+    return _EPOCH + timedelta(days=value)
+
+
+def _column(name: str) -> Tuple[str, object, object, object]:
+    """Return (struct code, pack, unpack, empty value) for a model field."""
+    kind = layout.KINDS[name]
+    if kind == layout.STRING:
+        width = getattr(LENGTHS, name.upper())
+        return f"{width}s", _pack_string(width), _unpack_string, b""
+    if kind == layout.NUMBER:
+        return "B", int, int, 0
+    if kind == layout.BOOLEAN:
+        return "?", bool, bool, False
+    return "H", _pack_date, _unpack_date, 0
+
+
+class _Block:
+    """Fixed-width layout of one model's fields behind a null bitmap."""
+
+    def __init__(self, names: List[str], prefix: str = "", suffix: str = ""):
+        self.names = names
+        columns = [_column(name) for name in names]
+        self.struct = struct.Struct(
+            "<" + prefix + "I" + "".join(c[0] for c in columns) + suffix
+        )
+        self.packers = [c[1] for c in columns]
+        self.unpackers = [c[2] for c in columns]
+        self.empty = [c[3] for c in columns]
+        self.fields = {name: i for i, name in enumerate(names)}
+        self.skip = len(prefix)  # values before the bitmap
+
+    def values(self, values) -> list:
+        """Return the bitmap followed by the packable values."""
+        bitmap = 0
+        packed = []
+        for bit, (value, pack, empty) in enumerate(
+            zip(values, self.packers, self.empty)
+        ):
+            if value is None:
+                bitmap |= 1 << bit
+                packed.append(empty)
+            else:
+                try:
+                    packed.append(pack(value))
+                except (AttributeError, TypeError) as error:
+                    raise ValueError(
+                        f"cannot store {value!r} as {self.names[bit]}"
+                    ) from error
+        return [bitmap, *packed]
+
+    def read(self, bitmap: int, raw) -> list:
+        return [
+            None if bitmap >> bit & 1 else unpack(value)
+            for bit, (value, unpack) in enumerate(zip(raw, self.unpackers))
+        ]
+
+
+_META_NAMES = [f.name for f in dataclass_fields(BoardingPassMetaData)]
+_DATA_NAMES = [f.name for f in dataclass_fields(BoardingPassData)][1:]
+_LEG_NAMES = [f.name for f in dataclass_fields(Leg) if f.name != _REMAINDER]
+
+# flags, leg count, bitmap, meta fields then data fields
+_PASS = _Block(_META_NAMES + _DATA_NAMES, prefix="BB")
+# bitmap (its last bit for the remainder), leg fields, remainder length
+_LEG = _Block(_LEG_NAMES, suffix="H")
+_REMAINDER_BIT = len(_LEG_NAMES)
+
+
+def dumps(bcbp: BarcodedBoardingPass) -> bytes:
+    """Serialize a pass to a binary record.
+
+    Raises ValueError for values the schema cannot hold, such as strings
+    wider than their LENGTHS entry or dates that are not UTC midnight.
+    """
+    data = bcbp.data
+    meta = bcbp.meta
+    legs = data.legs if data is not None else None
+    flags = (
+        (_HAS_DATA if data is not None else 0)
+        | (_HAS_META if meta is not None else 0)
+        | (_HAS_LEGS if legs is not None else 0)
+    )
+    values = [getattr(meta, name, None) for name in _META_NAMES]
+    values += [getattr(data, name, None) for name in _DATA_NAMES]
+    try:
+        parts = [_PASS.struct.pack(flags, len(legs or ()), *_PASS.values(values))]
+        remainders = []
+        for leg in legs or ():
+            leg_values = _LEG.values([getattr(leg, name) for name in _LEG_NAMES])
+            remainder = leg.for_individual_airline_use
+            if remainder is None:
+                leg_values[0] |= 1 << _REMAINDER_BIT
+                remainder = b""
+            else:
+                remainder = remainder.encode("latin-1")
+            remainders.append(remainder)
+            parts.append(_LEG.struct.pack(*leg_values, len(remainder)))
+    except (struct.error, UnicodeEncodeError) as error:
+        raise ValueError(f"cannot store pass: {error}") from error
+    return b"".join(parts + remainders)
+
+
+def loads(
+    record: Union[bytes, bytearray, memoryview],
+    models: Tuple[type, type, type, type] = MODELS,
+) -> BarcodedBoardingPass:
+    """Rebuild a pass from a binary record, using the given model classes."""
+    pass_model, data_model, meta_model, leg_model = models
+    flags, leg_count, bitmap, *raw = _PASS.struct.unpack_from(record, 0)
+    values = _PASS.read(bitmap, raw)
+    offset = _PASS.struct.size
+    remainder_offset = offset + leg_count * _LEG.struct.size
+
+    legs = []
+    for _ in range(leg_count):
+        bitmap, *raw, length = _LEG.struct.unpack_from(record, offset)
+        offset += _LEG.struct.size
+        remainder = None
+        if not bitmap >> _REMAINDER_BIT & 1:
+            end = remainder_offset + length
+            remainder = str(record[remainder_offset:end], "latin-1")
+        remainder_offset += length
+        legs.append(leg_model(*_LEG.read(bitmap, raw), remainder))
+
+    meta = data = None
+    if flags & _HAS_META:
+        meta = meta_model(*values[: len(_META_NAMES)])
+    if flags & _HAS_DATA:
+        data = data_model(
+            legs if flags & _HAS_LEGS else None, *values[len(_META_NAMES) :]
+        )
+    return pass_model(data=data, meta=meta)
+
+
+def read_field(
+    record: Union[bytes, bytearray, memoryview],
+    name: str,
+    leg: Optional[int] = None,
+):
+    """Read one field of a binary record without rebuilding the pass.
+
+    Leg fields need the leg index; pass-level fields are read with leg=None.
+    """
+    if leg is None:
+        block, offset = _PASS, 0
+    else:
+        leg_count = record[1]
+        if not 0 <= leg < leg_count:
+            raise IndexError(f"leg {leg} out of range for {leg_count} legs")
+        block, offset = _LEG, _PASS.struct.size + leg * _LEG.struct.size
+        if name == _REMAINDER:
+            return _read_remainder(record, leg, leg_count)
+    index = block.fields.get(name)
+    if index is None:
+        raise ValueError(f"unknown field {name!r}")
+    values = block.struct.unpack_from(record, offset)
+    if values[block.skip] >> index & 1:
+        return None
+    return block.unpackers[index](values[block.skip + 1 + index])
+
+
+def _read_remainder(record, leg: int, leg_count: int) -> Optional[str]:
+    offset = _PASS.struct.size
+    remainder_offset = offset + leg_count * _LEG.struct.size
+    for index in range(leg + 1):
+        bitmap, *_, length = _LEG.struct.unpack_from(record, offset)
+        if index == leg:
+            if bitmap >> _REMAINDER_BIT & 1:
+                return None
+            end = remainder_offset + length
+            return str(record[remainder_offset:end], "latin-1")
+        offset += _LEG.struct.size
+        remainder_offset += length
+
+
+# container: magic, records, then one uint64 offset per record, the record
+# count and the magic again
+_MAGIC = b"BCBPREC1"
+_OFFSET = struct.Struct("<Q")
+
+
+def write_records(
+    path: Union[str, os.PathLike], passes: Iterable[BarcodedBoardingPass]
+) -> int:
+    """Write passes to a record file and return how many were written."""
+    offsets = []
+    with open(path, "wb") as file:
+        file.write(_MAGIC)
+        position = len(_MAGIC)
+        for bcbp in passes:
+            record = dumps(bcbp)
+            offsets.append(position)
+            file.write(record)
+            position += len(record)
+        offsets.append(position)  # end of the last record
+        file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        file.write(_OFFSET.pack(len(offsets) - 1))
+        file.write(_MAGIC)
+    return len(offsets) - 1
+
+
+class RecordFile:
+    """Memory-mapped, random-access reader of a record file.
+
+    record() returns a memoryview into the map, and field() reads one value
+    in place, so nothing is copied until a pass or field is rebuilt. Release
+    any record views still held before closing the file.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        tail = len(self._view) - len(_MAGIC)
+        if self._view[: len(_MAGIC)] != _MAGIC or self._view[tail:] != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a record file")
+        (self._count,) = _OFFSET.unpack_from(self._view, tail - _OFFSET.size)
+        start = tail - _OFFSET.size - (self._count + 1) * _OFFSET.size
+        # copied out rather than cast in place: the table is little-endian
+        self._offsets = array("Q")
+        self._offsets.frombytes(self._view[start : tail - _OFFSET.size])
+        if sys.byteorder == "big":
+            self._offsets.byteswap()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, index: int) -> memoryview:
+        """Return the raw bytes of a record."""
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        return self._view[self._offsets[index] : self._offsets[index + 1]]
+
+    def __getitem__(self, index: int) -> BarcodedBoardingPass:
+        return loads(self.record(index))
+
+    def __iter__(self) -> Iterator[BarcodedBoardingPass]:
+        for index in range(self._count):
+            yield loads(self.record(index))
+
+    def field(self, index: int, name: str, leg: Optional[int] = None):
+        """Read one field of a record, see read_field."""
+        return read_field(self.record(index), name, leg)
+
+    def close(self):
+        self._offsets = None
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "RecordFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
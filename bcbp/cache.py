@@ -0,0 +1,148 @@
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Callable, NamedTuple, Optional, Union
+
+from .decode import decode
+from .models import COMPACT_MODELS, MODELS, BarcodedBoardingPass, _convert
+from .utils import bytes_to_string, current_year
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+
+def _sizeof(barcode: str, bcbp) -> int:
+    """Estimate the memory held by a cache entry."""
+    legs = bcbp.data.legs or []
+    size = sys.getsizeof(barcode) + sys.getsizeof(bcbp) + sys.getsizeof(legs)
+    for obj in (bcbp.data, bcbp.meta, *legs):
+        size += sys.getsizeof(obj)
+        for name in obj.__slots__:
+            value = getattr(obj, name)
+            if isinstance(value, (str, int, datetime)):
+                size += sys.getsizeof(value)
+    return size
+
+
+class DecodeCache:
+    """Bounded cache of decoded barcodes, keyed by string and reference year.
+
+    Entries are evicted least recently used first once max_entries or
+    max_bytes is exceeded, and expire ttl seconds after they were decoded.
+    Expired entries are dropped when looked up, and from the least recently
+    used end whenever a new entry is stored, so they do not hold memory until
+    the bounds are reached.
+    Results are stored in the compact model form and every hit returns a new
+    copy, so callers may mutate what they get. Safe to share between threads;
+    concurrent misses for the same barcode may each decode it.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 4096,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("set max_entries or max_bytes to bound the cache")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        # key -> (compact pass, size, expiry)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def decode(
+        self,
+        barcode_string: Union[str, bytes, bytearray, memoryview],
+        reference_year: Optional[int] = None,
+        compact: bool = False,
+    ) -> BarcodedBoardingPass:
+        """Decode like bcbp.decode, reusing an earlier result when cached."""
+        barcode_string = bytes_to_string(barcode_string)
+        if reference_year is None:
+            reference_year = current_year()
+        key = (barcode_string, reference_year)
+        models = COMPACT_MODELS if compact else MODELS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] is not None and entry[2] <= self._clock():
+                    self._remove(key)
+                    self._expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _convert(entry[0], models)
+            self._misses += 1
+
+        bcbp = decode(barcode_string, reference_year, compact=True)
+        size = _sizeof(barcode_string, bcbp)
+        expiry = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (bcbp, size, expiry)
+            self._bytes += size
+            self._expire()
+            self._evict()
+        return _convert(bcbp, models)
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key)[1]
+
+    def _expire(self):
+        entries = self._entries
+        now = self._clock()
+        # entries only move to the end on use, so stop at the first live one
+        while entries:
+            key, (_, size, expiry) = next(iter(entries.items()))
+            if expiry is None or expiry > now:
+                break
+            del entries[key]
+            self._bytes -= size
+            self._expirations += 1
+
+    def _evict(self):
+        entries = self._entries
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self._bytes,
+            )
+
+    def clear(self):
+        """Drop every entry; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
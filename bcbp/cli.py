@@ -0,0 +1,325 @@
+"""Bulk decode and encode from the command line, run as ``python -m bcbp``.
+
+    python -m bcbp decode scans.txt > passes.jsonl
+    python -m bcbp decode --format csv --workers 4 --stats < scans.txt
+    python -m bcbp decode --format columns --output passes.npy scans.txt
+    python -m bcbp encode passes.jsonl > scans.txt
+    python -m bcbp reconcile --gate gate*.log --security lane*.log --stats
+
+Input is read from the given files, or stdin for none or "-", one record per
+line. Rows that fail are reported on stderr with their file and line number
+and the remaining rows are still written; the exit status is then 1.
+reconcile writes one JSON line per finding, see bcbp.reconcile.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import fields
+from datetime import date
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .decode import decode
+from .encode import encode
+from .models import BarcodedBoardingPass, BoardingPassData, BoardingPassMetaData, Leg
+from .serialize import _to_dict_functions, from_dict
+from .utils import current_year
+
+JSONL = "jsonl"
+CSV = "csv"
+COLUMNS = "columns"
+
+_BUFFER_SIZE = 1 << 20
+
+# (path, line number) of an input row, for error reports
+Label = Tuple[str, int]
+
+
+def _read_lines(paths: List[str]) -> Iterator[Tuple[Label, bytes]]:
+    """Yield the non-blank lines of every input, without line endings."""
+    for path in paths or ["-"]:
+        if path == "-":
+            file = sys.stdin.buffer
+        else:
+            file = open(path, "rb", buffering=_BUFFER_SIZE)
+        try:
+            for number, line in enumerate(file, 1):
+                line = line.rstrip(b"\r\n")
+                if line.strip():
+                    yield (path, number), line
+        finally:
+            if file is not sys.stdin.buffer:
+                file.close()
+
+
+def _chunks(rows: Iterator[Tuple[Label, bytes]], size: int):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        labels, lines = zip(*chunk)
+        yield labels, list(lines)
+
+
+def _error(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def _csv_header() -> List[str]:
+    return (
+        [field.name for field in fields(BoardingPassMetaData)]
+        + [field.name for field in fields(BoardingPassData)[1:]]
+        + ["leg"]
+        + [field.name for field in fields(Leg)]
+    )
+
+
+def _decode_rows(
+    lines: List[bytes],
+    output_format: str,
+    reference_year: int,
+    omit_none: bool,
+    dates: str,
+) -> Tuple[str, List[Tuple[int, str]]]:
+    """Decode a chunk of lines to output text and (position, error) pairs."""
+    to_dict = _to_dict_functions(omit_none, dates)[BarcodedBoardingPass]
+    errors = []
+    passes = []
+    for position, line in enumerate(lines):
+        try:
+            passes.append(to_dict(decode(line, reference_year)))
+        except Exception as error:
+            errors.append((position, _error(error)))
+
+    if output_format == JSONL:
+        dumps = json.JSONEncoder(separators=(",", ":")).encode
+        return "".join(dumps(bcbp) + "\n" for bcbp in passes), errors
+
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    for bcbp in passes:
+        # one row per leg repeating the pass fields, or one without leg fields
+        head = [*bcbp["meta"].values(), *islice(bcbp["data"].values(), 1, None)]
+        legs = bcbp["data"]["legs"]
+        if not legs:
+            writer.writerow(head)
+        for index, leg in enumerate(legs):
+            writer.writerow(head + [index, *leg.values()])
+    return text.getvalue(), errors
+
+
+def _encode_rows(
+    lines: List[bytes], reference_year: int, dates: str
+) -> Tuple[str, List[Tuple[int, str]]]:
+    """Encode a chunk of JSON lines to barcode lines and (position, error) pairs."""
+    errors = []
+    barcodes = []
+    for position, line in enumerate(lines):
+        try:
+            value = json.loads(line)
+            bcbp = from_dict(value, dates=dates, reference_year=reference_year)
+            barcodes.append(encode(bcbp) + "\n")
+        except Exception as error:
+            errors.append((position, _error(error)))
+    return "".join(barcodes), errors
+
+
+def _run(
+    work: Callable[[List[bytes]], Tuple[str, List[Tuple[int, str]]]],
+    rows: Iterator[Tuple[Label, bytes]],
+    output,
+    workers: int,
+    chunk_size: int,
+) -> Tuple[int, int]:
+    """Process rows chunk by chunk, in order, and return (rows, errors)."""
+    count = failed = 0
+
+    def report(labels, result):
+        nonlocal count, failed
+        text, errors = result
+        output.write(text)
+        for position, message in errors:
+            path, number = labels[position]
+            print(f"{path}:{number}: {message}", file=sys.stderr)
+        count += len(labels)
+        failed += len(errors)
+
+    chunks = _chunks(rows, chunk_size)
+    if workers <= 1:
+        for labels, lines in chunks:
+            report(labels, work(lines))
+        return count, failed
+
+    # imported here as it pulls in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for labels, lines in chunks:
+            # keep a bounded number of chunks in flight so memory stays flat
+            if len(pending) >= workers * 2:
+                report(*_result(pending.popleft()))
+            pending.append((labels, executor.submit(work, lines)))
+        while pending:
+            report(*_result(pending.popleft()))
+    return count, failed
+
+
+def _result(item):
+    labels, future = item
+    return labels, future.result()
+
+
+def _open_output(path: Optional[str]):
+    if path is None or path == "-":
+        return sys.stdout
+    return open(path, "w", buffering=_BUFFER_SIZE, newline="")
+
+
+def _decode_columns(args, reference_year: int) -> Tuple[int, int]:
+    import numpy as np
+
+    from .columns import decode_columns
+
+    lines = [line for _, line in _read_lines(args.files)]
+    array = decode_columns(lines, reference_year, conditional=True)
+    np.save(args.output, array)
+    return len(lines), 0
+
+
+def _reconcile(args, reference_year: int) -> Tuple[int, int]:
+    from .reconcile import reconcile
+
+    result = reconcile(args.gate, args.security, args.workers, reference_year)
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    findings = [
+        *(("gate_only", key, 1) for key in result.gate_only),
+        *(("security_only", key, 1) for key in result.security_only),
+        *(("duplicate_boarding", *item) for item in result.duplicate_boardings),
+    ]
+    output = _open_output(args.output)
+    try:
+        for finding, (pnr, carrier, flight_number, day), count in findings:
+            value = {
+                "finding": finding,
+                "operating_carrier_pnr_code": pnr,
+                "operating_carrier_designator": carrier,
+                "flight_number": flight_number,
+                "date_of_flight": date.fromordinal(day).isoformat(),
+                "count": count,
+            }
+            output.write(dumps(value) + "\n")
+    finally:
+        if output is sys.stdout:
+            output.flush()
+        else:
+            output.close()
+    if result.incomplete:
+        print(f"{result.incomplete} legs lack a boarding key part", file=sys.stderr)
+    if result.errors:
+        print(f"{result.errors} records could not be decoded", file=sys.stderr)
+    return result.records, result.errors
+
+
+def _command(args) -> Tuple[int, int]:
+    # resolved once so every row and worker uses the same year
+    reference_year = args.reference_year or current_year()
+    if args.command == "reconcile":
+        return _reconcile(args, reference_year)
+    if args.command == "decode" and args.format == COLUMNS:
+        return _decode_columns(args, reference_year)
+
+    if args.command == "decode":
+        work = partial(
+            _decode_rows,
+            output_format=args.format,
+            reference_year=reference_year,
+            # CSV columns are positional
+            omit_none=args.omit_none and args.format == JSONL,
+            dates=args.dates,
+        )
+    else:
+        work = partial(_encode_rows, reference_year=reference_year, dates=args.dates)
+
+    output = _open_output(args.output)
+    try:
+        if args.command == "decode" and args.format == CSV:
+            output.write(",".join(_csv_header()) + "\n")
+        return _run(
+            work, _read_lines(args.files), output, args.workers, args.chunk_size
+        )
+    finally:
+        if output is sys.stdout:
+            output.flush()
+        else:
+            output.close()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m bcbp", description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    decode = commands.add_parser("decode", help="barcode lines to records")
+    decode.add_argument(
+        "--format",
+        choices=(JSONL, CSV, COLUMNS),
+        default=JSONL,
+        help="columns writes a NumPy .npy structured array to --output",
+    )
+    decode.add_argument(
+        "--omit-none", action="store_true", help="leave out empty JSON fields"
+    )
+    encode = commands.add_parser("encode", help="JSON lines to barcode lines")
+    for command in (decode, encode):
+        command.add_argument("files", nargs="*", metavar="FILE")
+        command.add_argument("-o", "--output", metavar="PATH")
+        command.add_argument("--reference-year", type=int, metavar="YEAR")
+        command.add_argument("--dates", choices=("iso", "julian"), default="iso")
+        command.add_argument("--workers", type=int, default=1, metavar="N")
+        command.add_argument("--chunk-size", type=int, default=2048, metavar="N")
+    reconcile = commands.add_parser(
+        "reconcile", help="gate scan logs against security scan logs"
+    )
+    reconcile.add_argument("--gate", nargs="+", required=True, metavar="FILE")
+    reconcile.add_argument("--security", nargs="+", required=True, metavar="FILE")
+    reconcile.add_argument("-o", "--output", metavar="PATH")
+    reconcile.add_argument("--reference-year", type=int, metavar="YEAR")
+    reconcile.add_argument(
+        "--workers", type=int, metavar="N", help="defaults to the CPU count"
+    )
+    for command in (decode, encode, reconcile):
+        command.add_argument(
+            "--stats", action="store_true", help="print rows/s to stderr"
+        )
+    return parser
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.command == "decode" and args.format == COLUMNS and not args.output:
+        parser.error("--format columns needs --output")
+
+    start = time.perf_counter()
+    try:
+        rows, errors = _command(args)
+    except BrokenPipeError:
+        # downstream closed early, e.g. piped into head; silence the final flush
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    elapsed = time.perf_counter() - start
+    if args.stats:
+        print(
+            f"{rows} rows, {errors} errors in {elapsed:.2f}s"
+            f" ({rows / elapsed if elapsed else 0:.0f} rows/s)",
+            file=sys.stderr,
+        )
+    return 1 if errors else 0
@@ -0,0 +1,498 @@
+from dataclasses import fields as dataclass_fields
+from datetime import datetime
+from typing import Iterable, List, Mapping, Optional, Sequence, Union
+
+from . import layout
+from .encode import _format_field
+from .models import LENGTHS, BoardingPassData, BoardingPassMetaData, Leg
+from .utils import current_year, number_to_hex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+_WHITESPACE = (0, 9, 10, 11, 12, 13, 28, 29, 30, 31, 32)
+_SPACE = 32
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("decode_columns requires numpy (pip install numpy)")
+
+
+def _to_matrix(barcodes):
+    """Pack barcodes into a NUL-padded (rows, width) uint8 matrix."""
+    barcodes = list(barcodes)
+    try:
+        packed = np.array(barcodes, dtype="S")
+    except UnicodeEncodeError:
+        packed = np.array(
+            [
+                b if isinstance(b, (bytes, bytearray)) else b.encode("ascii", "replace")
+                for b in barcodes
+            ],
+            dtype="S",
+        )
+    width = max(packed.dtype.itemsize, 1)
+    packed = packed.astype(f"S{width}")
+    return packed.view(np.uint8).reshape(len(barcodes), width)
+
+
+def _gather(raw, start, width: int, end=None):
+    """Read width bytes per row from start, blanking anything at or after end."""
+    positions = start[:, None] + np.arange(width)
+    limit = raw.shape[1] if end is None else np.minimum(end, raw.shape[1])[:, None]
+    outside = (positions < 0) | (positions >= limit)
+    block = np.take_along_axis(raw, np.clip(positions, 0, raw.shape[1] - 1), axis=1)
+    block[outside] = 0
+    return block
+
+
+def _trim(block):
+    """Replace trailing whitespace with NUL, like str.rstrip on every row."""
+    blank = np.isin(block, _WHITESPACE)
+    trailing = np.flip(np.logical_and.accumulate(np.flip(blank, 1), axis=1), 1)
+    block = block.copy()
+    block[trailing] = 0
+    return block
+
+
+def _as_bytes(block):
+    return np.ascontiguousarray(block).view(f"S{block.shape[1]}")[:, 0]
+
+
+def _digits(block):
+    """Parse a trimmed decimal field block, returning (values, valid mask)."""
+    rows = block.shape[0]
+    values = np.zeros(rows, dtype=np.int64)
+    valid = np.ones(rows, dtype=bool)
+    present = np.zeros(rows, dtype=bool)
+    for column in block.T:
+        digit = (column >= 48) & (column <= 57)
+        leading = (column == _SPACE) & ~present
+        valid &= digit | leading | (column == 0)
+        values = np.where(digit, values * 10 + (column.astype(np.int64) - 48), values)
+        present |= digit
+    return values, valid & present
+
+
+def _hex_digit(column):
+    values = np.full(column.shape, -1, dtype=np.int64)
+    for low, high, base in ((48, 57, 0), (65, 70, 10), (97, 102, 10)):
+        inside = (column >= low) & (column <= high)
+        values[inside] = column[inside] - low + base
+    return values
+
+
+def _section_size(block):
+    """Parse two-character hex section sizes; malformed sizes count as zero."""
+    first, second = _hex_digit(block[:, 0]), _hex_digit(block[:, 1])
+    first_blank = np.isin(block[:, 0], _WHITESPACE)
+    second_blank = np.isin(block[:, 1], _WHITESPACE)
+    size = np.where((first >= 0) & (second >= 0), first * 16 + second, 0)
+    size = np.where((first >= 0) & second_blank, first, size)
+    size = np.where(first_blank & (second >= 0), second, size)
+    return size
+
+
+def _year_start(years):
+    return (np.asarray(years, dtype=np.int64) - 1970).astype("datetime64[Y]").astype(
+        "datetime64[D]"
+    )
+
+
+def _julian(block, has_year_prefix: bool, reference_year: int):
+    """Convert trimmed Julian date blocks to datetime64[D], NaT when blank."""
+    rows = block.shape[0]
+    years = np.full(rows, reference_year, dtype=np.int64)
+    valid = np.ones(rows, dtype=bool)
+    if has_year_prefix:
+        digit = block[:, 0].astype(np.int64) - 48
+        valid &= (digit >= 0) & (digit <= 9)
+        years = reference_year - reference_year % 10 + digit
+        # handle year wrap-around, as day_of_year_to_date does
+        years = np.where(years - reference_year > 2, years - 10, years)
+        block = block[:, 1:]
+    days, parsed = _digits(block)
+    valid &= parsed
+    dates = _year_start(np.where(valid, years, 1970)) + (days - 1).astype(
+        "timedelta64[D]"
+    )
+    dates[~valid] = np.datetime64("NaT")
+    return dates
+
+
+def _column_type(field: layout.Field) -> str:
+    if field.kind in (layout.DATE, layout.DATE_WITH_YEAR):
+        return "M8[D]"
+    return f"S{field.length}"
+
+
+def _dtype(max_legs: int, conditional: bool):
+    legs = (max_legs,)
+    fields = [
+        ("format_code", "S1"),
+        ("number_of_legs_encoded", "u1"),
+        ("passenger_name", f"S{layout.LENGTHS.PASSENGER_NAME}"),
+        ("electronic_ticket_indicator", "S1"),
+    ]
+    for field in layout.MANDATORY_LEG:
+        fields.append((field.name, _column_type(field), legs))
+    if conditional:
+        fields.append(("beginning_of_version_number", "S1"))
+        fields.append(("version_number", "i1"))
+        for field in layout.SECTION_A:
+            fields.append((field.name, _column_type(field)))
+        for field in layout.SECTION_B:
+            fields.append((field.name, f"S{field.length}", legs))
+        fields.append(("beginning_of_security_data", "S1"))
+        fields.append(("type_of_security_data", "S1"))
+        fields.append(("security_data", f"S{layout.LENGTHS.SECURITY_DATA}"))
+    return np.dtype(fields)
+
+
+def _fill(out, block, section_fields, reference_year: int, leg: Optional[int] = None):
+    """Store each field of a gathered fixed-width section block into out."""
+    for field, start, end in layout.offsets(section_fields):
+        piece = _trim(block[:, start:end])
+        if field.kind == layout.DATE:
+            value = _julian(piece, False, reference_year)
+        elif field.kind == layout.DATE_WITH_YEAR:
+            value = _julian(piece, True, reference_year)
+        else:
+            value = _as_bytes(piece)
+        if leg is None:
+            out[field.name] = value
+        else:
+            out[field.name][:, leg] = value
+
+
+def _adjust_flight_dates(out, max_legs: int):
+    """Vectorized equivalent of adjust_flight_dates for the decoded columns."""
+    issued = out["date_of_issue_of_boarding_pass"]
+    has_issue = ~np.isnat(issued)
+    issuance_year = issued.astype("datetime64[Y]")
+    this_year = issuance_year.astype("datetime64[D]")
+    next_year = (issuance_year + 1).astype("datetime64[D]")
+    for leg in range(max_legs):
+        flight = out["date_of_flight"][:, leg]
+        adjust = has_issue & ~np.isnat(flight)
+        day = flight - flight.astype("datetime64[Y]").astype("datetime64[D]")
+        moved = this_year + day
+        moved = np.where(moved < issued, next_year + day, moved)
+        out["date_of_flight"][:, leg] = np.where(adjust, moved, flight)
+
+
+def decode_columns(
+    barcodes: Iterable[Union[str, bytes]],
+    reference_year: Optional[int] = None,
+    conditional: bool = False,
+):
+    """Decode a batch of BCBP barcodes into a NumPy structured array.
+
+    The mandatory block is read with vectorized slicing: one row per barcode,
+    fixed-width byte fields with trailing spaces removed, per-leg fields as
+    sub-arrays of shape (max legs,) and Julian dates as datetime64[D] (NaT when
+    missing). With conditional=True, a second pass also reads the version,
+    section A, section B and security fields, and flight dates are adjusted to
+    the issuance date as decode does. Malformed section sizes, numbers and
+    dates are read as empty or missing rather than raising.
+    """
+    _require_numpy()
+    if reference_year is None:
+        reference_year = current_year()
+
+    raw = _to_matrix(barcodes)
+    rows = raw.shape[0]
+
+    number_of_legs, valid = _digits(_trim(raw[:, 1:2]))
+    number_of_legs = np.where(valid, number_of_legs, 0)
+    max_legs = int(number_of_legs.max()) if rows else 0
+
+    out = np.zeros(rows, dtype=_dtype(max_legs, conditional))
+    for field, start, end in layout.offsets(layout.HEADER):
+        if field.kind == layout.STRING:
+            out[field.name] = _as_bytes(_trim(raw[:, start:end]))
+    out["number_of_legs_encoded"] = number_of_legs
+    if conditional:
+        out["version_number"] = -1
+        out["date_of_issue_of_boarding_pass"] = np.datetime64("NaT")
+
+    position = np.full(rows, layout.HEADER_LENGTH, dtype=np.int64)
+    for leg in range(max_legs):
+        active = number_of_legs > leg
+        block = _gather(raw, position, layout.MANDATORY_LEG_LENGTH)
+        block[~active] = 0
+        _fill(out, block, layout.MANDATORY_LEG, reference_year, leg)
+
+        size_at = position + layout.MANDATORY_LEG_LENGTH
+        start = size_at + layout.SECTION_SIZE_LENGTH
+        end = start + _section_size(_gather(raw, size_at, 2))
+
+        if conditional:
+            offset = start
+            if leg == 0:
+                block = _gather(raw, start, _CONDITIONAL_HEADER_LENGTH, end)
+                block[~active] = 0
+                out["beginning_of_version_number"] = _as_bytes(_trim(block[:, :1]))
+                version, valid = _digits(_trim(block[:, 1:2]))
+                out["version_number"] = np.where(valid, version, -1)
+
+                size_at = start + _CONDITIONAL_HEADER_LENGTH
+                section_start = size_at + layout.SECTION_SIZE_LENGTH
+                section_end = section_start + _section_size(
+                    _gather(raw, size_at, 2, end)
+                )
+                block = _gather(
+                    raw,
+                    section_start,
+                    layout.section_length(layout.SECTION_A),
+                    np.minimum(section_end, end),
+                )
+                block[~active] = 0
+                _fill(out, block, layout.SECTION_A, reference_year)
+                offset = section_end
+
+            section_start = offset + layout.SECTION_SIZE_LENGTH
+            section_end = section_start + _section_size(_gather(raw, offset, 2, end))
+            block = _gather(
+                raw,
+                section_start,
+                layout.section_length(layout.SECTION_B),
+                np.minimum(section_end, end),
+            )
+            block[~active] = 0
+            _fill(out, block, layout.SECTION_B, reference_year, leg)
+
+        position = np.where(active, end, position)
+
+    if conditional:
+        block = _gather(raw, position, _SECURITY_HEADER_LENGTH)
+        _fill(out, block, layout.SECURITY_HEADER, reference_year)
+        size_at = position + _SECURITY_HEADER_LENGTH
+        start = size_at + layout.SECTION_SIZE_LENGTH
+        end = start + _section_size(_gather(raw, size_at, 2))
+        block = _gather(raw, start, layout.LENGTHS.SECURITY_DATA, end)
+        _fill(out, block, layout.SECURITY, reference_year)
+        _adjust_flight_dates(out, max_legs)
+
+    return out
+
+
+_LEG_NAMES = frozenset(field.name for field in dataclass_fields(Leg))
+_PASS_NAMES = frozenset(
+    field.name
+    for model in (BoardingPassData, BoardingPassMetaData)
+    for field in dataclass_fields(model)
+) - {"legs"}
+# mandatory leg fields encode zero-fills before padding, and their widths
+_ZERO_FILLS = {
+    "flight_number": LENGTHS.FLIGHT_NUMBER - 1,
+    "seat_number": LENGTHS.SEAT_NUMBER,
+    "check_in_sequence_number": LENGTHS.CHECK_IN_SEQUENCE_NUMBER - 1,
+}
+
+
+def _values(column, rows: int) -> list:
+    """Return a column as a list of Python values, bytes read as latin-1."""
+    if column is None:
+        return [None] * rows
+    if np is not None and isinstance(column, np.ndarray):
+        if column.dtype.kind == "M":
+            # whole days, as datetime objects rather than dates from tolist()
+            column = column.astype("datetime64[D]").astype("datetime64[us]")
+        values = column.tolist()
+    else:
+        values = list(column)
+    if len(values) != rows:
+        raise ValueError(f"columns have {len(values)} and {rows} rows")
+    return [
+        str(value, "latin-1") if isinstance(value, bytes) else value
+        for value in values
+    ]
+
+
+def _formatted(values: list, length: Optional[int], add_year_prefix=False) -> list:
+    """Format a column like encode formats each field, once per distinct value."""
+    # keyed by type too, as True == 1 but encodes as "Y"
+    cache = {}
+    result = []
+    for value in values:
+        if isinstance(value, datetime):
+            # equal instants in different timezones can fall on different days,
+            # and only the local date is encoded
+            key = (datetime, value.date())
+        else:
+            key = (type(value), value)
+        text = cache.get(key)
+        if text is None:
+            text = cache[key] = _format_field(value, length, add_year_prefix)
+        result.append(text)
+    return result
+
+
+def _defaulted(values: list, default) -> list:
+    # encode fills in meta defaults with `or`
+    return [value or default for value in values]
+
+
+def _section(values: List[list], section_fields) -> list:
+    """Format a fixed-width section column-wise, sized to its last defined field.
+
+    values holds one column per field of section_fields.
+    """
+    formatted = []
+    ends = None
+    offset = 0
+    for column, field in zip(values, section_fields):
+        formatted.append(
+            _formatted(column, field.length, field.kind == layout.DATE_WITH_YEAR)
+        )
+        offset += field.length
+        if ends is None:
+            ends = [0 if value is None else offset for value in column]
+        else:
+            ends = [
+                end if value is None else offset for end, value in zip(ends, column)
+            ]
+    texts = ["".join(parts) for parts in zip(*formatted)]
+    return [_sized(text, end) for text, end in zip(texts, ends)]
+
+
+def _sized(text: str, length: int) -> str:
+    """Like encode._sized, for text at least length long."""
+    return number_to_hex(length)[:2] + text[:length]
+
+
+def encode_columns(
+    columns: Mapping[str, Sequence], legs: int = 1
+) -> List[str]:
+    """Encode a batch of passes given as columns of field values.
+
+    columns maps model field names (or a NumPy structured array's field
+    names) to equal-length sequences or arrays. With legs above 1, every leg
+    field column holds a sequence of one value per leg in each row, such as a
+    (rows, legs) array. Fields without a column are None in every row, and
+    dates may also be NumPy datetime64 values. Each string is what encode
+    returns for the same values, but every field is formatted a column at a
+    time and each distinct value once per column.
+    """
+    names = columns.dtype.names if hasattr(columns, "dtype") else list(columns)
+    unknown = set(names) - _LEG_NAMES - _PASS_NAMES
+    if unknown:
+        raise ValueError(f"unknown fields {sorted(unknown)}")
+    if not names:
+        return []
+    rows = len(columns[names[0]])
+    if legs < 1:
+        return [""] * rows  # as encode does for passes without legs
+
+    def column(name: str) -> list:
+        return _values(columns[name] if name in names else None, rows)
+
+    def leg_columns(name: str) -> List[list]:
+        """Return one list of values per leg."""
+        if name not in names:
+            return [[None] * rows] * legs
+        if legs == 1:
+            return [_values(columns[name], rows)]
+        per_row = columns[name]
+        if np is not None and isinstance(per_row, np.ndarray):
+            return [_values(per_row[:, leg], rows) for leg in range(legs)]
+        per_row = list(per_row)
+        return [_values([row[leg] for row in per_row], rows) for leg in range(legs)]
+
+    version_numbers = _defaulted(column("version_number"), 6)
+    mandatory_only = [version != 6 for version in version_numbers]
+    number_of_legs = [value or legs for value in column("number_of_legs_encoded")]
+
+    pieces = [
+        _formatted(_defaulted(column("format_code"), "M"), LENGTHS.FORMAT_CODE),
+        _formatted(number_of_legs, LENGTHS.NUMBER_OF_LEGS_ENCODED),
+        _formatted(column("passenger_name"), LENGTHS.PASSENGER_NAME),
+        _formatted(
+            _defaulted(column("electronic_ticket_indicator"), "E"),
+            LENGTHS.ELECTRONIC_TICKET_INDICATOR,
+        ),
+    ]
+
+    unique = None
+    if not all(mandatory_only):
+        unique = [
+            a + b + c
+            for a, b, c in zip(
+                _formatted(
+                    _defaulted(column("beginning_of_version_number"), ">"),
+                    LENGTHS.BEGINNING_OF_VERSION_NUMBER,
+                ),
+                _formatted(version_numbers, LENGTHS.VERSION_NUMBER),
+                _section(
+                    [column(field.name) for field in layout.SECTION_A],
+                    layout.SECTION_A,
+                ),
+            )
+        ]
+
+    mandatory = {field.name: leg_columns(field.name) for field in layout.MANDATORY_LEG}
+    section_b = {field.name: leg_columns(field.name) for field in layout.SECTION_B}
+    remainders = leg_columns("for_individual_airline_use")
+    for leg in range(legs):
+        for field in layout.MANDATORY_LEG:
+            values = mandatory[field.name][leg]
+            width = _ZERO_FILLS.get(field.name)
+            if width is not None:
+                if None in values:
+                    raise ValueError(f"{field.name} is missing on leg {leg}")
+                values = [str(value).zfill(width) for value in values]
+            pieces.append(
+                _formatted(
+                    values, field.length, field.kind == layout.DATE_WITH_YEAR
+                )
+            )
+        if unique is None:
+            pieces.append(["00"] * rows)
+            continue
+
+        conditional = [
+            b + r
+            for b, r in zip(
+                _section(
+                    [section_b[field.name][leg] for field in layout.SECTION_B],
+                    layout.SECTION_B,
+                ),
+                _formatted(remainders[leg], None),
+            )
+        ]
+        if leg == 0:
+            conditional = [u + c for u, c in zip(unique, conditional)]
+        pieces.append(
+            [
+                "00" if only else _sized(text, len(text))
+                for only, text in zip(mandatory_only, conditional)
+            ]
+        )
+
+    security_data = column("security_data")
+    if any(value is not None for value in security_data):
+        security = [
+            "" if value is None else a + b + c
+            for value, a, b, c in zip(
+                security_data,
+                _formatted(
+                    _defaulted(column("beginning_of_security_data"), "^"),
+                    LENGTHS.BEGINNING_OF_SECURITY_DATA,
+                ),
+                _formatted(
+                    _defaulted(column("type_of_security_data"), "1"),
+                    LENGTHS.TYPE_OF_SECURITY_DATA,
+                ),
+                _section([security_data], layout.SECURITY),
+            )
+        ]
+        pieces.append(security)
+
+    return ["".join(row) for row in zip(*pieces)]
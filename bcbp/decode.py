@@ -1,13 +1,18 @@
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional, Union
 
+from . import instrument
 from .models import (
+    COMPACT_MODELS,
     LENGTHS,
+    MODELS,
     BarcodedBoardingPass,
     BoardingPassData,
     BoardingPassMetaData,
     Leg,
 )
+from .engine import decode_compiled
+from .projection import Projection, compile_projection
 from .utils import date_to_day_of_year, day_of_year_to_date, hex_to_number
 
 
@@ -78,9 +83,35 @@ class SectionDecoder:
 
 
 def decode(
+    barcode_string: Union[str, bytes, bytearray, memoryview],
+    reference_year: Optional[int] = None,
+    fields: Optional[Union[Iterable[str], Projection]] = None,
+    compact: bool = False,
+) -> BarcodedBoardingPass:
+    """Decode a BCBP barcode string to BarcodedBoardingPass object.
+
+    The barcode may also be given as bytes, bytearray or memoryview. If fields
+    (field names or a Projection) is given, only those fields are decoded and
+    everything else is left as None. With compact=True the result is built
+    from the __slots__ Compact* model classes instead.
+    """
+    models = COMPACT_MODELS if compact else MODELS
+    if fields is not None:
+        if not isinstance(fields, Projection):
+            fields = compile_projection(fields)
+        return fields.decode(barcode_string, reference_year, models)
+    if instrument._active is not None:
+        return instrument._active.decode(barcode_string, reference_year, models)
+    return decode_compiled(barcode_string, reference_year, models)
+
+
+def decode_reference(
     barcode_string: str, reference_year: Optional[int] = None
 ) -> BarcodedBoardingPass:
-    """Decode a BCBP barcode string to BarcodedBoardingPass object."""
+    """Decode field by field with SectionDecoder.
+
+    This is the reference implementation the compiled engine is checked against.
+    """
     bcbp = BarcodedBoardingPass()
     main_section = SectionDecoder(barcode_string)
 
@@ -0,0 +1,350 @@
+"""Decoding that reports problems instead of raising.
+
+decode_checked walks a barcode like decode does, but reads section sizes and
+dates without raising, and records the first problem it finds as a
+Diagnostic. Structural problems follow the rules of validate; field problems
+are non-blank numbers, dates and flags that could not be read.
+"""
+from collections import Counter
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from . import layout
+from .engine import _EMPTY_SECTION_A, _EMPTY_SECTION_B, adjust_flight_dates
+from .engine import compile_reader
+from .models import COMPACT_MODELS, MODELS, BarcodedBoardingPass
+from .utils import bytes_to_string, current_year, day_of_year_to_date
+from .validate import ErrorCode
+
+# section names
+HEADER = "header"
+MANDATORY = "mandatory"
+CONDITIONAL = "conditional"
+SECTION_A = "section_a"
+SECTION_B = "section_b"
+SECURITY = "security"
+
+_SIZE = layout.SECTION_SIZE_LENGTH
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+_HEX_DIGITS = "0123456789ABCDEFabcdef"
+_LEG_COUNTS = "123456789"
+
+# section sizes as validate accepts them, and as decode reads them
+_STRICT_SIZES = {a + b: int(a + b, 16) for a in _HEX_DIGITS for b in _HEX_DIGITS}
+_SIZES = {"": 0}
+for _a in _HEX_DIGITS + " ":
+    _SIZES[_a.rstrip()] = int(_a.rstrip() or "00", 16)
+    for _b in _HEX_DIGITS + " ":
+        _SIZES[_a + _b] = int((_a + _b).rstrip() or "00", 16)
+
+
+class Diagnostic(NamedTuple):
+    kind: ErrorCode
+    section: Optional[str] = None
+    field: Optional[str] = None
+    offset: int = -1
+    # decoding stopped or ran out of input, so later fields are missing
+    partial: bool = False
+
+    def __bool__(self) -> bool:
+        return self.kind == ErrorCode.OK
+
+
+_OK = Diagnostic(ErrorCode.OK)
+
+
+def _date(value: str, has_year_prefix: bool, reference_year: Optional[int]):
+    value = value.rstrip()
+    if not value:
+        return None
+    # a try block costs nothing unless it catches, and only junk dates raise
+    try:
+        return day_of_year_to_date(value, has_year_prefix, reference_year)
+    except ValueError:
+        return None
+
+
+_CONVERTERS = {"_date": _date}
+_read_header = compile_reader(layout.HEADER, converters=_CONVERTERS)
+_read_mandatory_leg = compile_reader(layout.MANDATORY_LEG, converters=_CONVERTERS)
+_read_conditional_header = compile_reader(
+    layout.CONDITIONAL_HEADER, converters=_CONVERTERS
+)
+_read_section_a = compile_reader(layout.SECTION_A, converters=_CONVERTERS)
+_read_section_b = compile_reader(layout.SECTION_B, converters=_CONVERTERS)
+_read_security_header = compile_reader(layout.SECURITY_HEADER, converters=_CONVERTERS)
+_read_security = compile_reader(layout.SECURITY, converters=_CONVERTERS)
+
+_CODES = {
+    layout.NUMBER: ErrorCode.BAD_NUMBER,
+    layout.DATE: ErrorCode.BAD_DATE,
+    layout.DATE_WITH_YEAR: ErrorCode.BAD_DATE,
+    layout.BOOLEAN: ErrorCode.BAD_FLAG,
+}
+
+
+def _checks(section_fields) -> list:
+    """Return (index, name, start, end, code) for fields that can be malformed."""
+    return [
+        (index, field.name, start, end, _CODES[field.kind])
+        for index, (field, start, end) in enumerate(layout.offsets(section_fields))
+        if field.kind in _CODES
+    ]
+
+
+_MANDATORY_CHECKS = _checks(layout.MANDATORY_LEG)
+_CONDITIONAL_CHECKS = _checks(layout.CONDITIONAL_HEADER)
+_SECTION_A_CHECKS = _checks(layout.SECTION_A)
+_SECTION_B_CHECKS = _checks(layout.SECTION_B)
+_MANDATORY_OFFSETS = layout.offsets(layout.MANDATORY_LEG)
+_HEADER_OFFSETS = layout.offsets(layout.HEADER)
+
+
+def _check(
+    found: list, section: str, checks, values, string: str, position: int, base: int
+):
+    """Record the fields read as None or False that hold more than blanks or N.
+
+    The section starts at position in string, and string at base in the
+    barcode.
+    """
+    for index, name, start, end, code in checks:
+        value = values[index]
+        if value is None:
+            if string[position + start : position + end].strip():
+                found.append(Diagnostic(code, section, name, base + position + start))
+        elif value is False:
+            if string[position + start : position + end].rstrip() != "N":
+                found.append(Diagnostic(code, section, name, base + position + start))
+
+
+def _field_at(offsets, position: int) -> Optional[str]:
+    for field, _, end in offsets:
+        if position < end:
+            return field.name
+    return None
+
+
+def _split(
+    found: list, section: str, string: str, position: int, end: int, base: int
+) -> Tuple[str, int, bool]:
+    """Split a sized section from string like split_section, without raising.
+
+    Returns the section, the position after it and whether its size could be
+    read; end is where the enclosing data ends and base the offset of string
+    in the barcode, for diagnostics.
+    """
+    raw = string[position : position + _SIZE]
+    size = _SIZES.get(raw)
+    if size is None:
+        found.append(
+            Diagnostic(ErrorCode.BAD_SECTION_SIZE, section, None, base + position, True)
+        )
+        return "", position + _SIZE, False
+    kind = None
+    if position > end or (position < end and position + _SIZE > end):
+        kind = ErrorCode.SECTION_OVERRUN
+    elif position < end:
+        if raw not in _STRICT_SIZES:
+            kind = ErrorCode.BAD_SECTION_SIZE
+        elif position + _SIZE + size > end:
+            kind = ErrorCode.SECTION_OVERRUN
+    if kind is not None:
+        partial = kind == ErrorCode.SECTION_OVERRUN
+        found.append(Diagnostic(kind, section, None, base + position, partial))
+    start = position + _SIZE
+    if start >= len(string):
+        return "", start, True
+    return string[start : start + size].rstrip(), start + size, True
+
+
+def decode_checked(
+    barcode_string: Union[str, bytes, bytearray, memoryview],
+    reference_year: Optional[int] = None,
+    compact: bool = False,
+) -> Tuple[BarcodedBoardingPass, Diagnostic]:
+    """Decode a BCBP barcode string without raising.
+
+    Returns the pass and a Diagnostic of the first problem found, which is
+    truthy when there was none. Well-formed barcodes decode exactly as with
+    decode. Fields that cannot be read are left as None, and where a section
+    size cannot be read the rest of the barcode is skipped and the diagnostic
+    is marked partial.
+    """
+    pass_model, data_model, meta_model, leg_model = (
+        COMPACT_MODELS if compact else MODELS
+    )
+    s = bytes_to_string(barcode_string) or ""
+    if reference_year is None:
+        reference_year = current_year()
+    length = len(s)
+    found: List[Diagnostic] = []
+
+    format_code, number_of_legs, passenger_name, electronic_ticket_indicator = (
+        _read_header(s, 0, reference_year)
+    )
+    if length < layout.HEADER_LENGTH:
+        field = _field_at(_HEADER_OFFSETS, length)
+        found.append(Diagnostic(ErrorCode.TOO_SHORT, HEADER, field, length, True))
+    elif s[0] != "M":
+        found.append(Diagnostic(ErrorCode.BAD_FORMAT_CODE, HEADER, "format_code", 0))
+    if length > 1 and s[1] not in _LEG_COUNTS:
+        found.append(
+            Diagnostic(
+                ErrorCode.BAD_LEG_COUNT, HEADER, "number_of_legs_encoded", 1, True
+            )
+        )
+    number_of_legs = number_of_legs or 0
+
+    beginning_of_version_number = version_number = None
+    section_a = _EMPTY_SECTION_A
+    legs = []
+    position = layout.HEADER_LENGTH
+    complete = True
+    for leg_index in range(number_of_legs):
+        if position + layout.MANDATORY_LEG_LENGTH + _SIZE > length:
+            field = _field_at(_MANDATORY_OFFSETS, length - position)
+            found.append(
+                Diagnostic(ErrorCode.TOO_SHORT, MANDATORY, field, length, True)
+            )
+        mandatory = _read_mandatory_leg(s, position, reference_year)
+        _check(found, MANDATORY, _MANDATORY_CHECKS, mandatory, s, position, 0)
+
+        position += layout.MANDATORY_LEG_LENGTH
+        base = position + _SIZE
+        conditional, position, complete = _split(
+            found, CONDITIONAL, s, position, length, 0
+        )
+        if not complete:
+            legs.append(leg_model(*mandatory))
+            break
+        # where the conditional section ends as encoded, before trimming
+        end = min(position, length) - base
+        if end <= 0:
+            legs.append(leg_model(*mandatory, *_EMPTY_SECTION_B, None))
+            continue
+
+        offset = 0
+        if leg_index == 0:
+            if s[base] != ">":
+                found.append(
+                    Diagnostic(
+                        ErrorCode.BAD_VERSION_MARKER,
+                        CONDITIONAL,
+                        "beginning_of_version_number",
+                        base,
+                    )
+                )
+            beginning_of_version_number, version_number = values = (
+                _read_conditional_header(conditional, 0, reference_year)
+            )
+            _check(
+                found, CONDITIONAL, _CONDITIONAL_CHECKS, values, conditional, 0, base
+            )
+            offset = _CONDITIONAL_HEADER_LENGTH
+            section, next_offset, ok = _split(
+                found, SECTION_A, conditional, offset, end, base
+            )
+            if section:
+                section_a = _read_section_a(section, 0, reference_year)
+                start = base + offset + _SIZE
+                _check(
+                    found, SECTION_A, _SECTION_A_CHECKS, section_a, section, 0, start
+                )
+            offset = next_offset
+            if not ok:
+                legs.append(leg_model(*mandatory))
+                continue
+
+        # past the end only when section A is absent, or already reported
+        section, next_offset, ok = _split(
+            found, SECTION_B, conditional, offset, max(end, offset), base
+        )
+        section_b = _EMPTY_SECTION_B
+        if section:
+            section_b = _read_section_b(section, 0, reference_year)
+            start = base + offset + _SIZE
+            _check(found, SECTION_B, _SECTION_B_CHECKS, section_b, section, 0, start)
+        offset = next_offset
+        remainder = (conditional[offset:].rstrip() or None) if ok else None
+        legs.append(leg_model(*mandatory, *section_b, remainder))
+
+    beginning_of_security_data = type_of_security_data = security_data = None
+    if complete:
+        beginning_of_security_data, type_of_security_data = _read_security_header(
+            s, position, reference_year
+        )
+        if position < length:
+            if s[position] != "^":
+                found.append(
+                    Diagnostic(
+                        ErrorCode.BAD_SECURITY_MARKER,
+                        SECURITY,
+                        "beginning_of_security_data",
+                        position,
+                    )
+                )
+            position += _SECURITY_HEADER_LENGTH
+            if position + _SIZE > length:
+                found.append(
+                    Diagnostic(ErrorCode.TOO_SHORT, SECURITY, None, length, True)
+                )
+            section, position, _ = _split(found, SECURITY, s, position, length, 0)
+            (security_data,) = _read_security(section, 0, reference_year)
+
+    data = data_model(
+        legs,
+        passenger_name,
+        *section_a,
+        type_of_security_data=type_of_security_data,
+        security_data=security_data,
+    )
+    adjust_flight_dates(data)
+
+    bcbp = pass_model(
+        data=data,
+        meta=meta_model(
+            format_code=format_code,
+            number_of_legs_encoded=number_of_legs,
+            electronic_ticket_indicator=electronic_ticket_indicator,
+            beginning_of_version_number=beginning_of_version_number,
+            version_number=version_number,
+            beginning_of_security_data=beginning_of_security_data,
+        ),
+    )
+    return bcbp, found[0] if found else _OK
+
+
+class DiagnosticReport:
+    """Counts of the diagnostics of a batch, by kind and by field."""
+
+    def __init__(self, diagnostics: Iterable[Diagnostic] = ()):
+        self.total = 0
+        self.failed = 0
+        self.partial = 0
+        self.kinds = Counter()
+        # (section, field) -> count
+        self.fields = Counter()
+        for diagnostic in diagnostics:
+            self.add(diagnostic)
+
+    def add(self, diagnostic: Diagnostic):
+        self.total += 1
+        if diagnostic.kind:
+            self.failed += 1
+            self.partial += diagnostic.partial
+            self.kinds[diagnostic.kind] += 1
+            self.fields[diagnostic.section, diagnostic.field] += 1
+
+    def to_dict(self) -> dict:
+        """Return the counts as plain dicts and numbers."""
+        return {
+            "total": self.total,
+            "failed": self.failed,
+            "partial": self.partial,
+            "kinds": {kind.name: count for kind, count in self.kinds.items()},
+            "fields": {
+                f"{section}.{field}" if field else section: count
+                for (section, field), count in self.fields.items()
+            },
+        }
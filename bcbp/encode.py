@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional, Union
+from operator import attrgetter
+from typing import Optional, Tuple, Union
 
+from . import instrument, layout
 from .models import LENGTHS, BarcodedBoardingPass, BoardingPassMetaData
 from .utils import date_to_day_of_year, number_to_hex
 
@@ -71,9 +73,8 @@ class SectionBuilder:
         return "".join(self.output)
 
 
-def encode(bcbp: BarcodedBoardingPass) -> str:
-    """Encode a BarcodedBoardingPass object to BCBP string format."""
-    # set default meta values if not provided
+def _set_meta_defaults(bcbp: BarcodedBoardingPass):
+    """Fill in default meta values on bcbp, as encoding always has."""
     if bcbp.meta is None:
         bcbp.meta = BoardingPassMetaData()
 
@@ -86,6 +87,149 @@ def encode(bcbp: BarcodedBoardingPass) -> str:
     bcbp.meta.version_number = bcbp.meta.version_number or 6
     bcbp.meta.beginning_of_security_data = bcbp.meta.beginning_of_security_data or "^"
 
+
+def _format_field(
+    field: Union[str, int, bool, datetime, None],
+    length: Optional[int] = None,
+    add_year_prefix: bool = False,
+) -> str:
+    """Format a field like SectionBuilder.add_field, padded or cut to length."""
+    if field is None:
+        value = ""
+    elif isinstance(field, bool):
+        value = "Y" if field else "N"
+    elif isinstance(field, datetime):
+        value = date_to_day_of_year(field, add_year_prefix)
+    else:
+        value = str(field)
+    if length is None:
+        return value
+    return value[:length].ljust(length)
+
+
+def _format_section(values, section_fields) -> Tuple[str, int]:
+    """Format a fixed-width section.
+
+    Returns the section string and the length up to its last defined field,
+    which is what SectionBuilder.add_section writes as the section size.
+    """
+    parts = []
+    offset = defined_end = 0
+    for value, field in zip(values, section_fields):
+        parts.append(
+            _format_field(value, field.length, field.kind == layout.DATE_WITH_YEAR)
+        )
+        offset += field.length
+        if value is not None:
+            defined_end = offset
+    return "".join(parts), defined_end
+
+
+def _sized(section: str, length: int) -> str:
+    """Return section cut to length and prefixed with its hex size."""
+    return _format_field(number_to_hex(length), 2) + _format_field(section, length)
+
+
+_SECTION_A_VALUES = attrgetter(*(field.name for field in layout.SECTION_A))
+_SECTION_B_VALUES = attrgetter(*(field.name for field in layout.SECTION_B))
+
+
+def encode(bcbp: BarcodedBoardingPass) -> str:
+    """Encode a BarcodedBoardingPass object to BCBP string format."""
+    if instrument._active is not None:
+        return instrument._active.encode(bcbp)
+    return _encode(bcbp)
+
+
+def _encode(bcbp: BarcodedBoardingPass) -> str:
+    _set_meta_defaults(bcbp)
+    if not bcbp.data or not bcbp.data.legs or len(bcbp.data.legs) == 0:
+        return ""
+
+    meta = bcbp.meta
+    data = bcbp.data
+    parts = [
+        _format_field(meta.format_code, LENGTHS.FORMAT_CODE),
+        _format_field(meta.number_of_legs_encoded, LENGTHS.NUMBER_OF_LEGS_ENCODED),
+        _format_field(data.passenger_name, LENGTHS.PASSENGER_NAME),
+        _format_field(
+            meta.electronic_ticket_indicator, LENGTHS.ELECTRONIC_TICKET_INDICATOR
+        ),
+    ]
+
+    mandatory_only = meta.version_number != 6
+    for leg_index, leg in enumerate(data.legs):
+        mandatory, _ = _format_section(
+            (
+                leg.operating_carrier_pnr_code,
+                leg.from_city_airport_code,
+                leg.to_city_airport_code,
+                leg.operating_carrier_designator,
+                leg.flight_number.zfill(LENGTHS.FLIGHT_NUMBER - 1),
+                leg.date_of_flight,
+                leg.compartment_code,
+                leg.seat_number.zfill(LENGTHS.SEAT_NUMBER),
+                leg.check_in_sequence_number.zfill(
+                    LENGTHS.CHECK_IN_SEQUENCE_NUMBER - 1
+                ),
+                leg.passenger_status,
+            ),
+            layout.MANDATORY_LEG,
+        )
+        parts.append(mandatory)
+        if mandatory_only:
+            parts.append("00")
+            continue
+
+        conditional = []
+        if leg_index == 0:
+            # unique fields, then section A (unique passenger data)
+            conditional.append(
+                _format_field(
+                    meta.beginning_of_version_number,
+                    LENGTHS.BEGINNING_OF_VERSION_NUMBER,
+                )
+            )
+            conditional.append(
+                _format_field(meta.version_number, LENGTHS.VERSION_NUMBER)
+            )
+            conditional.append(
+                _sized(*_format_section(_SECTION_A_VALUES(data), layout.SECTION_A))
+            )
+        # section B (leg-specific data)
+        conditional.append(
+            _sized(*_format_section(_SECTION_B_VALUES(leg), layout.SECTION_B))
+        )
+        conditional.append(_format_field(leg.for_individual_airline_use))
+
+        # every part after the unique fields is defined, so nothing is trimmed
+        conditional_string = "".join(conditional)
+        parts.append(_sized(conditional_string, len(conditional_string)))
+
+    # security data section
+    if data.security_data is not None:
+        parts.append(
+            _format_field(
+                meta.beginning_of_security_data, LENGTHS.BEGINNING_OF_SECURITY_DATA
+            )
+        )
+        parts.append(
+            _format_field(
+                data.type_of_security_data or "1", LENGTHS.TYPE_OF_SECURITY_DATA
+            )
+        )
+        parts.append(_sized(*_format_section((data.security_data,), layout.SECURITY)))
+
+    return "".join(parts)
+
+
+def encode_reference(bcbp: BarcodedBoardingPass) -> str:
+    """Encode field by field with SectionBuilder.
+
+    This is the reference implementation encode is checked against.
+    """
+    _set_meta_defaults(bcbp)
+
     barcode_data = SectionBuilder()
     if not bcbp.data or not bcbp.data.legs or len(bcbp.data.legs) == 0:
         return ""
@@ -0,0 +1,227 @@
+from dataclasses import fields
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Collection, Optional, Tuple, Union
+
+from . import layout
+from .models import MODELS, BarcodedBoardingPass, BoardingPassData, Leg
+from .utils import (
+    bytes_to_string,
+    current_year,
+    date_to_day_of_year,
+    day_of_year_to_date,
+)
+
+
+def _number(value: str) -> Optional[int]:
+    value = value.rstrip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _date(value: str, has_year_prefix: bool, reference_year: Optional[int]):
+    value = value.rstrip()
+    if not value:
+        return None
+    return day_of_year_to_date(value, has_year_prefix, reference_year)
+
+
+def _boolean(value: str) -> Optional[bool]:
+    value = value.rstrip()
+    if not value:
+        return None
+    return value == "Y"
+
+
+# per-kind converters taking (value, reference_year), for reading single fields
+CONVERTERS = {
+    layout.STRING: lambda value, _: value.rstrip() or None,
+    layout.NUMBER: lambda value, _: _number(value),
+    layout.DATE: lambda value, year: _date(value, False, year),
+    layout.DATE_WITH_YEAR: lambda value, year: _date(value, True, year),
+    layout.BOOLEAN: lambda value, _: _boolean(value),
+}
+
+_EXPRESSIONS = {
+    layout.STRING: "{0}.rstrip() or None",
+    layout.NUMBER: "_number({0})",
+    layout.DATE: "_date({0}, False, reference_year)",
+    layout.DATE_WITH_YEAR: "_date({0}, True, reference_year)",
+    layout.BOOLEAN: "_boolean({0})",
+}
+
+
+def compile_reader(
+    section_fields,
+    names: Optional[Collection[str]] = None,
+    converters: Optional[dict] = None,
+) -> Callable[[str, int, Optional[int]], Tuple]:
+    """Compile a fixed-width section layout into a flat reader function.
+
+    The reader takes ``(string, offset, reference_year)`` and returns one value
+    per field, with the same trimming and conversion rules as SectionDecoder.
+    If names is given, only those fields are read, in layout order. converters
+    replaces the _number, _date or _boolean helpers the reader calls.
+    """
+    lines = ["def read(s, p, reference_year):", "    return ("]
+    for field, start, end in layout.offsets(section_fields):
+        if names is not None and field.name not in names:
+            continue
+        piece = f"s[p + {start}:p + {end}]"
+        lines.append(f"        {_EXPRESSIONS[field.kind].format(piece)},")
+    lines.append("    )")
+    namespace = {"_number": _number, "_date": _date, "_boolean": _boolean}
+    namespace.update(converters or {})
+    exec("\n".join(lines), namespace)
+    return namespace["read"]
+
+
+def split_section(string: str, position: int) -> Tuple[str, int]:
+    """Split the hex-size-prefixed section at position from string.
+
+    Returns the section contents, right-trimmed as SectionDecoder sees them,
+    and the position right after the section.
+    """
+    size = int(string[position : position + 2].rstrip() or "00", 16)
+    start = position + layout.SECTION_SIZE_LENGTH
+    if start >= len(string):
+        return "", start
+    return string[start : start + size].rstrip(), start + size
+
+
+def skip_section(string: str, position: int) -> int:
+    """Return the position after the hex-size-prefixed section at position."""
+    size = int(string[position : position + 2].rstrip() or "00", 16)
+    start = position + layout.SECTION_SIZE_LENGTH
+    if start >= len(string):
+        return start
+    return start + size
+
+
+def _check_order(model, *sections):
+    names = [
+        field if isinstance(field, str) else field.name
+        for section in sections
+        for field in section
+    ]
+    expected = [field.name for field in fields(model)][: len(names)]
+    if names != expected:
+        raise RuntimeError(f"layout does not match {model.__name__} field order")
+
+
+# models are built positionally from the compiled section readers
+_check_order(Leg, layout.MANDATORY_LEG, layout.SECTION_B)
+_check_order(BoardingPassData, ("legs", "passenger_name"), layout.SECTION_A)
+
+_read_header = compile_reader(layout.HEADER)
+_read_mandatory_leg = compile_reader(layout.MANDATORY_LEG)
+_read_conditional_header = compile_reader(layout.CONDITIONAL_HEADER)
+_read_section_a = compile_reader(layout.SECTION_A)
+_read_section_b = compile_reader(layout.SECTION_B)
+_read_security_header = compile_reader(layout.SECURITY_HEADER)
+_read_security = compile_reader(layout.SECURITY)
+
+# absent sections decode to all-None fields without running their reader
+_EMPTY_SECTION_A = (None,) * len(layout.SECTION_A)
+_EMPTY_SECTION_B = (None,) * len(layout.SECTION_B)
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+
+
+@lru_cache(maxsize=16384)
+def adjust_flight_date(date_of_flight: datetime, date_of_issue: datetime) -> datetime:
+    """Move a flight date to its first occurrence on or after the issuance date."""
+    issuance_year = date_of_issue.year
+    day_of_year = date_to_day_of_year(date_of_flight)
+    date_of_flight = day_of_year_to_date(day_of_year, False, issuance_year)
+    if date_of_flight < date_of_issue:
+        date_of_flight = day_of_year_to_date(day_of_year, False, issuance_year + 1)
+    return date_of_flight
+
+
+def adjust_flight_dates(data: BoardingPassData):
+    """Adjust all flight dates of data to its issuance date, if present."""
+    date_of_issue = data.date_of_issue_of_boarding_pass
+    if date_of_issue is None:
+        return
+    for leg in data.legs:
+        if leg.date_of_flight is not None:
+            leg.date_of_flight = adjust_flight_date(leg.date_of_flight, date_of_issue)
+
+
+def decode_compiled(
+    barcode_string: Union[str, bytes, bytearray, memoryview],
+    reference_year: Optional[int] = None,
+    models: Tuple[type, type, type, type] = MODELS,
+) -> BarcodedBoardingPass:
+    """Decode a BCBP barcode string using the compiled section readers.
+
+    models gives the (pass, data, meta, leg) classes to build, see MODELS.
+    """
+    pass_model, data_model, meta_model, leg_model = models
+    s = bytes_to_string(barcode_string) or ""
+    if reference_year is None:
+        reference_year = current_year()
+
+    format_code, number_of_legs, passenger_name, electronic_ticket_indicator = (
+        _read_header(s, 0, reference_year)
+    )
+    number_of_legs = number_of_legs or 0
+
+    beginning_of_version_number = version_number = None
+    section_a = _EMPTY_SECTION_A
+    legs = []
+    position = layout.HEADER_LENGTH
+    for leg_index in range(number_of_legs):
+        mandatory = _read_mandatory_leg(s, position, reference_year)
+        conditional, position = split_section(
+            s, position + layout.MANDATORY_LEG_LENGTH
+        )
+
+        offset = 0
+        if leg_index == 0:
+            beginning_of_version_number, version_number = _read_conditional_header(
+                conditional, 0, reference_year
+            )
+            section, offset = split_section(conditional, _CONDITIONAL_HEADER_LENGTH)
+            if section:
+                section_a = _read_section_a(section, 0, reference_year)
+
+        section, offset = split_section(conditional, offset)
+        section_b = (
+            _read_section_b(section, 0, reference_year) if section else _EMPTY_SECTION_B
+        )
+        legs.append(
+            leg_model(*mandatory, *section_b, conditional[offset:].rstrip() or None)
+        )
+
+    beginning_of_security_data, type_of_security_data = _read_security_header(
+        s, position, reference_year
+    )
+    section, position = split_section(s, position + _SECURITY_HEADER_LENGTH)
+    (security_data,) = _read_security(section, 0, reference_year)
+
+    data = data_model(
+        legs,
+        passenger_name,
+        *section_a,
+        type_of_security_data=type_of_security_data,
+        security_data=security_data,
+    )
+    adjust_flight_dates(data)
+
+    return pass_model(
+        data=data,
+        meta=meta_model(
+            format_code=format_code,
+            number_of_legs_encoded=number_of_legs,
+            electronic_ticket_indicator=electronic_ticket_indicator,
+            beginning_of_version_number=beginning_of_version_number,
+            version_number=version_number,
+            beginning_of_security_data=beginning_of_security_data,
+        ),
+    )
@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .models import BarcodedBoardingPass, Leg
+
+FlightKey = Tuple[str, str, int]
+BoardingKey = Tuple[str, str, str, int]
+
+
+class IndexEntry(NamedTuple):
+    pass_id: int
+    leg_index: int
+    bcbp: BarcodedBoardingPass
+
+    @property
+    def leg(self) -> Leg:
+        return self.bcbp.data.legs[self.leg_index]
+
+
+def _add(index: dict, key, leg_id: int) -> bool:
+    """Add leg_id to the postings of key; return True if key was already there.
+
+    A key seen once maps straight to its leg id, and only repeated keys pay
+    for an array of ids.
+    """
+    postings = index.get(key)
+    if postings is None:
+        index[key] = leg_id
+        return False
+    if type(postings) is int:
+        index[key] = array("I", (postings, leg_id))
+    else:
+        postings.append(leg_id)
+    return True
+
+
+def _postings(index: dict, key) -> Iterable[int]:
+    postings = index.get(key)
+    if postings is None:
+        return ()
+    if type(postings) is int:
+        return (postings,)
+    return postings
+
+
+def _strip(value: Optional[str]) -> str:
+    return (value or "").strip()
+
+
+def _flight_number(value: Optional[str]) -> str:
+    # manifests often drop the zero padding BCBP uses
+    return _strip(value).lstrip("0")
+
+
+def _day(value: Optional[date]) -> int:
+    return -1 if value is None else value.toordinal()
+
+
+def _complete(boarding: BoardingKey) -> bool:
+    """Return whether a boarding key has all of its parts.
+
+    Missing parts become "" and -1, so incomplete keys of unrelated legs
+    would otherwise match each other.
+    """
+    pnr, carrier, flight_number, day = boarding
+    return bool(pnr and carrier and flight_number) and day >= 0
+
+
+class PassIndex:
+    """Multi-key index over the legs of decoded boarding passes.
+
+    Legs can be looked up by PNR, by flight (carrier, flight number and
+    date), by frequent flyer number and by passenger name, and ranged over by
+    flight date. Passes are added incrementally; a leg whose PNR and flight
+    were already indexed is recorded as a duplicate boarding, unless one of
+    them is missing. Keys are compared without surrounding spaces, and flight
+    numbers without leading zeros. Each leg costs a few machine words plus
+    one posting per key, so memory grows linearly with the number of legs.
+    """
+
+    def __init__(self, passes: Iterable[BarcodedBoardingPass] = ()):
+        self._passes: List[BarcodedBoardingPass] = []
+        # leg id -> pass id and leg index
+        self._leg_pass = array("I")
+        self._leg_index = array("B")
+        self._pnr: Dict[str, object] = {}
+        self._flight: Dict[FlightKey, object] = {}
+        self._frequent_flyer: Dict[str, object] = {}
+        self._name: Dict[str, object] = {}
+        self._date: Dict[int, object] = {}
+        self._days: List[int] = []  # sorted keys of _date
+        self._boarding: Dict[BoardingKey, object] = {}
+        self._duplicates: Dict[BoardingKey, None] = {}  # insertion-ordered set
+        for bcbp in passes:
+            self.add(bcbp)
+
+    def __len__(self) -> int:
+        return len(self._passes)
+
+    @property
+    def leg_count(self) -> int:
+        return len(self._leg_pass)
+
+    def add(self, bcbp: BarcodedBoardingPass) -> int:
+        """Index every leg of bcbp and return its pass id."""
+        pass_id = len(self._passes)
+        self._passes.append(bcbp)
+        name = _strip(bcbp.data.passenger_name)
+        for leg_index, leg in enumerate(bcbp.data.legs or ()):
+            leg_id = len(self._leg_pass)
+            self._leg_pass.append(pass_id)
+            self._leg_index.append(leg_index)
+
+            pnr = _strip(leg.operating_carrier_pnr_code)
+            carrier = _strip(leg.operating_carrier_designator)
+            flight_number = _flight_number(leg.flight_number)
+            day = _day(leg.date_of_flight)
+            _add(self._pnr, pnr, leg_id)
+            _add(self._flight, (carrier, flight_number, day), leg_id)
+            if leg.frequent_flyer_number is not None:
+                _add(self._frequent_flyer, _strip(leg.frequent_flyer_number), leg_id)
+            _add(self._name, name, leg_id)
+            if not _add(self._date, day, leg_id):
+                insort(self._days, day)
+            boarding = (pnr, carrier, flight_number, day)
+            if _complete(boarding) and _add(self._boarding, boarding, leg_id):
+                self._duplicates[boarding] = None
+        return pass_id
+
+    def _entries(self, leg_ids: Iterable[int]) -> List[IndexEntry]:
+        return [
+            IndexEntry(
+                self._leg_pass[leg_id],
+                self._leg_index[leg_id],
+                self._passes[self._leg_pass[leg_id]],
+            )
+            for leg_id in leg_ids
+        ]
+
+    def by_pnr(self, pnr: str) -> List[IndexEntry]:
+        """Return the legs booked under a PNR."""
+        return self._entries(_postings(self._pnr, _strip(pnr)))
+
+    def by_flight(
+        self, carrier: str, flight_number: str, date_of_flight: Optional[date]
+    ) -> List[IndexEntry]:
+        """Return the legs on a flight."""
+        key = (_strip(carrier), _flight_number(flight_number), _day(date_of_flight))
+        return self._entries(_postings(self._flight, key))
+
+    def by_frequent_flyer(self, frequent_flyer_number: str) -> List[IndexEntry]:
+        """Return the legs carrying a frequent flyer number."""
+        key = _strip(frequent_flyer_number)
+        return self._entries(_postings(self._frequent_flyer, key))
+
+    def by_name(self, passenger_name: str) -> List[IndexEntry]:
+        """Return the legs of passes issued to a passenger name."""
+        return self._entries(_postings(self._name, _strip(passenger_name)))
+
+    def by_date(self, start: date, end: Optional[date] = None) -> Iterator[IndexEntry]:
+        """Yield the legs flown from start to end inclusive, in date order."""
+        days = self._days
+        first = bisect_left(days, start.toordinal())
+        last = bisect_right(days, (end or start).toordinal())
+        for day in days[first:last]:
+            yield from self._entries(_postings(self._date, day))
+
+    def seen(
+        self,
+        pnr: str,
+        carrier: str,
+        flight_number: str,
+        date_of_flight: Optional[date],
+    ) -> bool:
+        """Return whether a leg with this PNR and flight is already indexed."""
+        key = (
+            _strip(pnr),
+            _strip(carrier),
+            _flight_number(flight_number),
+            _day(date_of_flight),
+        )
+        return key in self._boarding
+
+    def duplicates(self) -> Iterator[Tuple[BoardingKey, List[IndexEntry]]]:
+        """Yield each (PNR, carrier, flight number, day ordinal) seen more than once.
+
+        Each key comes with all of its legs, in the order they were added.
+        """
+        for key in self._duplicates:
+            yield key, self._entries(self._boarding[key])
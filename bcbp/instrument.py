@@ -0,0 +1,293 @@
+"""Opt-in instrumentation of decode and encode.
+
+While an Instrumentation is enabled, decode and encode run through copies of
+their implementations whose section readers and writers are wrapped with
+timers and field accounting. When it is disabled the only cost is one check
+of the module-level _active hook per call. Decodes limited to a projection
+(decode with fields) bypass the engine readers and are not instrumented.
+"""
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from types import FunctionType
+from typing import Dict, Iterable, Optional, Sequence
+
+from . import layout
+
+# set by enable(); read by decode and encode on every call
+_active: Optional["Instrumentation"] = None
+
+LENGTH_BUCKETS = (60, 100, 150, 200, 300, 400, 600)
+LEG_BUCKETS = tuple(range(1, 10))
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus exposes them."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            total += count
+            buckets[str(bound)] = total
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+def _copy_with(function: FunctionType, replacements: dict) -> FunctionType:
+    """Return a copy of function that sees replacements among its globals."""
+    namespace = dict(function.__globals__)
+    namespace.update(replacements)
+    return FunctionType(
+        function.__code__, namespace, function.__name__, function.__defaults__
+    )
+
+
+class Instrumentation:
+    """Collects per-stage timings, histograms and field counts.
+
+    Stages are "header", "mandatory", "conditional" (conditional header and
+    sections A and B), "sections" (locating size-prefixed sections), "dates"
+    (flight date adjustment) and "security", plus the whole "decode" and
+    "encode" calls. Fields are counted as missing when blank and malformed
+    when a non-blank value was coerced to None (or a flag other than Y/N
+    read as False). Subclass and override count, time, observe and account
+    to send the data elsewhere. Updates are not locked, so counts from several
+    threads sharing one instance are approximate.
+    """
+
+    def __init__(
+        self,
+        # histograms describe decoded input
+        length_buckets: Sequence[float] = LENGTH_BUCKETS,
+        leg_buckets: Sequence[float] = LEG_BUCKETS,
+    ):
+        self.counters = Counter()
+        # (operation, stage) -> [calls, seconds]
+        self.timers: Dict[tuple, list] = {}
+        self.histograms = {
+            "barcode_length": Histogram(length_buckets),
+            "legs": Histogram(leg_buckets),
+        }
+        # (operation, exception name) -> count
+        self.errors = Counter()
+        self.missing = Counter()
+        self.malformed = Counter()
+        self._decode = self._encode = None
+
+    # sinks
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def time(self, operation: str, stage: str, seconds: float):
+        timer = self.timers.get((operation, stage))
+        if timer is None:
+            timer = self.timers[(operation, stage)] = [0, 0.0]
+        timer[0] += 1
+        timer[1] += seconds
+
+    def observe(self, histogram: str, value: float):
+        self.histograms[histogram].observe(value)
+
+    def account(self, offsets, string: str, position: int, values: Iterable):
+        """Count the missing and malformed fields among a section's values.
+
+        offsets are the section's (field, start, end) entries, see layout.offsets.
+        """
+        for (field, start, end), value in zip(offsets, values):
+            if value is None:
+                if string[position + start : position + end].strip():
+                    self.malformed[field.name] += 1
+                else:
+                    self.missing[field.name] += 1
+            elif value is False and field.kind == layout.BOOLEAN:
+                if string[position + start : position + end].rstrip() != "N":
+                    self.malformed[field.name] += 1
+
+    # instrumented calls
+
+    def decode(self, barcode_string, reference_year, models):
+        if self._decode is None:
+            self._decode = self._instrument_decode()
+        start = time.perf_counter()
+        try:
+            bcbp = self._decode(barcode_string, reference_year, models)
+        except Exception as error:
+            self.errors["decode", type(error).__name__] += 1
+            raise
+        self.time("decode", "total", time.perf_counter() - start)
+        self.count("decode_calls")
+        # decode treats None as an empty barcode
+        self.observe("barcode_length", len(barcode_string or ""))
+        self.observe("legs", len(bcbp.data.legs))
+        return bcbp
+
+    def encode(self, bcbp):
+        if self._encode is None:
+            self._encode = self._instrument_encode()
+        start = time.perf_counter()
+        try:
+            barcode = self._encode(bcbp)
+        except Exception as error:
+            self.errors["encode", type(error).__name__] += 1
+            raise
+        self.time("encode", "total", time.perf_counter() - start)
+        self.count("encode_calls")
+        return barcode
+
+    def _timed(self, operation: str, stage: str, function, section_fields=None):
+        clock = time.perf_counter
+        offsets = None if section_fields is None else layout.offsets(section_fields)
+
+        def timed(*args):
+            start = clock()
+            result = function(*args)
+            self.time(operation, stage, clock() - start)
+            if offsets is not None:
+                self.account(offsets, args[0], args[1], result)
+            return result
+
+        return timed
+
+    def _instrument_decode(self):
+        from . import engine
+
+        readers = {
+            "_read_header": ("header", layout.HEADER),
+            "_read_mandatory_leg": ("mandatory", layout.MANDATORY_LEG),
+            "_read_conditional_header": ("conditional", layout.CONDITIONAL_HEADER),
+            "_read_section_a": ("conditional", layout.SECTION_A),
+            "_read_section_b": ("conditional", layout.SECTION_B),
+            "_read_security_header": ("security", layout.SECURITY_HEADER),
+            "_read_security": ("security", layout.SECURITY),
+        }
+        replacements = {
+            name: self._timed("decode", stage, getattr(engine, name), section_fields)
+            for name, (stage, section_fields) in readers.items()
+        }
+        replacements["split_section"] = self._timed(
+            "decode", "sections", engine.split_section
+        )
+        replacements["adjust_flight_dates"] = self._timed(
+            "decode", "dates", engine.adjust_flight_dates
+        )
+        return _copy_with(engine.decode_compiled, replacements)
+
+    def _instrument_encode(self):
+        from .encode import _encode, _format_section, _sized
+
+        stages = {
+            id(layout.MANDATORY_LEG): "mandatory",
+            id(layout.SECTION_A): "conditional",
+            id(layout.SECTION_B): "conditional",
+            id(layout.SECURITY): "security",
+        }
+        clock = time.perf_counter
+
+        def timed_format_section(values, section_fields):
+            start = clock()
+            result = _format_section(values, section_fields)
+            self.time("encode", stages[id(section_fields)], clock() - start)
+            return result
+
+        return _copy_with(
+            _encode,
+            {
+                "_format_section": timed_format_section,
+                "_sized": self._timed("encode", "sections", _sized),
+            },
+        )
+
+    # export
+
+    def to_dict(self) -> dict:
+        """Return everything collected as plain dicts and numbers."""
+        return {
+            "counters": dict(self.counters),
+            "errors": {
+                f"{operation}.{error}": count
+                for (operation, error), count in self.errors.items()
+            },
+            "timers": {
+                f"{operation}.{stage}": {"calls": calls, "seconds": seconds}
+                for (operation, stage), (calls, seconds) in self.timers.items()
+            },
+            "histograms": {
+                name: histogram.to_dict()
+                for name, histogram in self.histograms.items()
+            },
+            "fields": {
+                "missing": dict(self.missing),
+                "malformed": dict(self.malformed),
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "bcbp") -> str:
+        """Return everything collected in the Prometheus text exposition format."""
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        if self.errors:
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+        for (operation, error), count in sorted(self.errors.items()):
+            labels = f'operation="{operation}",error="{error}"'
+            lines.append(f"{prefix}_errors_total{{{labels}}} {count}")
+
+        if self.timers:
+            lines.append(f"# TYPE {prefix}_stage_seconds summary")
+        for (operation, stage), (count, seconds) in sorted(self.timers.items()):
+            labels = f'operation="{operation}",stage="{stage}"'
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {seconds!r}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {count}")
+
+        for name, histogram in self.histograms.items():
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for bound, count in histogram.to_dict()["buckets"].items():
+                lines.append(f'{prefix}_{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{prefix}_{name}_sum {histogram.sum}")
+            lines.append(f"{prefix}_{name}_count {histogram.count}")
+
+        for kind, counts in (("missing", self.missing), ("malformed", self.malformed)):
+            if counts:
+                lines.append(f"# TYPE {prefix}_field_{kind}_total counter")
+            for field, count in sorted(counts.items()):
+                lines.append(f'{prefix}_field_{kind}_total{{field="{field}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def enable(instrumentation: Optional[Instrumentation] = None) -> Instrumentation:
+    """Start instrumenting decode and encode, returning the collector in use."""
+    global _active
+    _active = instrumentation if instrumentation is not None else Instrumentation()
+    return _active
+
+
+def disable():
+    """Stop instrumenting decode and encode."""
+    global _active
+    _active = None
+
+
+@contextmanager
+def instrumented(instrumentation: Optional[Instrumentation] = None):
+    """Instrument decode and encode within a with block."""
+    global _active
+    previous = _active
+    try:
+        yield enable(instrumentation)
+    finally:
+        _active = previous
@@ -0,0 +1,167 @@
+from typing import List, NamedTuple, Tuple
+
+from .models import LENGTHS
+
+# field kinds, matching the SectionDecoder/SectionBuilder accessors
+STRING = "string"
+NUMBER = "number"
+DATE = "date"
+DATE_WITH_YEAR = "date_with_year"
+BOOLEAN = "boolean"
+
+
+class Field(NamedTuple):
+    name: str
+    length: int
+    kind: str = STRING
+    owner: str = "leg"
+
+
+# main section, before the first leg
+HEADER = (
+    Field("format_code", LENGTHS.FORMAT_CODE, STRING, "meta"),
+    Field("number_of_legs_encoded", LENGTHS.NUMBER_OF_LEGS_ENCODED, NUMBER, "meta"),
+    Field("passenger_name", LENGTHS.PASSENGER_NAME, STRING, "data"),
+    Field(
+        "electronic_ticket_indicator",
+        LENGTHS.ELECTRONIC_TICKET_INDICATOR,
+        STRING,
+        "meta",
+    ),
+)
+
+# repeated for every leg, followed by the conditional section size
+MANDATORY_LEG = (
+    Field("operating_carrier_pnr_code", LENGTHS.OPERATING_CARRIER_PNR_CODE),
+    Field("from_city_airport_code", LENGTHS.FROM_CITY_AIRPORT_CODE),
+    Field("to_city_airport_code", LENGTHS.TO_CITY_AIRPORT_CODE),
+    Field("operating_carrier_designator", LENGTHS.OPERATING_CARRIER_DESIGNATOR),
+    Field("flight_number", LENGTHS.FLIGHT_NUMBER),
+    Field("date_of_flight", LENGTHS.DATE_OF_FLIGHT, DATE),
+    Field("compartment_code", LENGTHS.COMPARTMENT_CODE),
+    Field("seat_number", LENGTHS.SEAT_NUMBER),
+    Field("check_in_sequence_number", LENGTHS.CHECK_IN_SEQUENCE_NUMBER),
+    Field("passenger_status", LENGTHS.PASSENGER_STATUS),
+)
+
+# start of the first leg's conditional section, followed by the section A size
+CONDITIONAL_HEADER = (
+    Field(
+        "beginning_of_version_number",
+        LENGTHS.BEGINNING_OF_VERSION_NUMBER,
+        STRING,
+        "meta",
+    ),
+    Field("version_number", LENGTHS.VERSION_NUMBER, NUMBER, "meta"),
+)
+
+# unique passenger data (first leg only)
+SECTION_A = (
+    Field("passenger_description", LENGTHS.PASSENGER_DESCRIPTION, STRING, "data"),
+    Field("source_of_check_in", LENGTHS.SOURCE_OF_CHECK_IN, STRING, "data"),
+    Field(
+        "source_of_boarding_pass_issuance",
+        LENGTHS.SOURCE_OF_BOARDING_PASS_ISSUANCE,
+        STRING,
+        "data",
+    ),
+    Field(
+        "date_of_issue_of_boarding_pass",
+        LENGTHS.DATE_OF_ISSUE_OF_BOARDING_PASS,
+        DATE_WITH_YEAR,
+        "data",
+    ),
+    Field("document_type", LENGTHS.DOCUMENT_TYPE, STRING, "data"),
+    Field(
+        "airline_designator_of_boarding_pass_issuer",
+        LENGTHS.AIRLINE_DESIGNATOR_OF_BOARDING_PASS_ISSUER,
+        STRING,
+        "data",
+    ),
+    Field(
+        "baggage_tag_licence_plate_number",
+        LENGTHS.BAGGAGE_TAG_LICENCE_PLATE_NUMBER,
+        STRING,
+        "data",
+    ),
+    Field(
+        "first_non_consecutive_baggage_tag_licence_plate_number",
+        LENGTHS.FIRST_NON_CONSECUTIVE_BAGGAGE_TAG_LICENCE_PLATE_NUMBER,
+        STRING,
+        "data",
+    ),
+    Field(
+        "second_non_consecutive_baggage_tag_licence_plate_number",
+        LENGTHS.SECOND_NON_CONSECUTIVE_BAGGAGE_TAG_LICENCE_PLATE_NUMBER,
+        STRING,
+        "data",
+    ),
+)
+
+# leg-specific data, followed by the individual airline use remainder
+SECTION_B = (
+    Field("airline_numeric_code", LENGTHS.AIRLINE_NUMERIC_CODE),
+    Field("document_form_serial_number", LENGTHS.DOCUMENT_FORM_SERIAL_NUMBER),
+    Field("selectee_indicator", LENGTHS.SELECTEE_INDICATOR),
+    Field(
+        "international_documentation_verification",
+        LENGTHS.INTERNATIONAL_DOCUMENTATION_VERIFICATION,
+    ),
+    Field("marketing_carrier_designator", LENGTHS.MARKETING_CARRIER_DESIGNATOR),
+    Field(
+        "frequent_flyer_airline_designator", LENGTHS.FREQUENT_FLYER_AIRLINE_DESIGNATOR
+    ),
+    Field("frequent_flyer_number", LENGTHS.FREQUENT_FLYER_NUMBER),
+    Field("id_ad_indicator", LENGTHS.ID_AD_INDICATOR),
+    Field("free_baggage_allowance", LENGTHS.FREE_BAGGAGE_ALLOWANCE),
+    Field("fast_track", LENGTHS.FAST_TRACK, BOOLEAN),
+)
+
+# after the last leg, followed by the security section size
+SECURITY_HEADER = (
+    Field(
+        "beginning_of_security_data",
+        LENGTHS.BEGINNING_OF_SECURITY_DATA,
+        STRING,
+        "meta",
+    ),
+    Field("type_of_security_data", LENGTHS.TYPE_OF_SECURITY_DATA, STRING, "data"),
+)
+
+SECURITY = (Field("security_data", LENGTHS.SECURITY_DATA, STRING, "data"),)
+
+SECTION_SIZE_LENGTH = 2
+
+
+def offsets(fields) -> List[Tuple[Field, int, int]]:
+    """Return (field, start, end) for each field of a fixed-width section."""
+    result = []
+    start = 0
+    for field in fields:
+        result.append((field, start, start + field.length))
+        start += field.length
+    return result
+
+
+def section_length(fields) -> int:
+    """Return the total width of a fixed-width section."""
+    return sum(field.length for field in fields)
+
+
+HEADER_LENGTH = section_length(HEADER)
+MANDATORY_LEG_LENGTH = section_length(MANDATORY_LEG)
+
+# field name -> kind, across all sections
+KINDS = {
+    field.name: field.kind
+    for section in (
+        HEADER,
+        MANDATORY_LEG,
+        CONDITIONAL_HEADER,
+        SECTION_A,
+        SECTION_B,
+        SECURITY_HEADER,
+        SECURITY,
+    )
+    for field in section
+}
@@ -0,0 +1,318 @@
+from typing import Callable, List, Optional, Tuple, Union
+
+from . import layout
+from .engine import CONVERTERS, adjust_flight_date, split_section
+from .models import BarcodedBoardingPass, BoardingPassData, BoardingPassMetaData, Leg
+from .utils import BufferText, current_year
+
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+_NUMBER_OF_LEGS = layout.offsets(layout.HEADER)[1]
+
+
+class _Sections:
+    """Locates the sections of a raw barcode string, each at most once."""
+
+    def __init__(self, barcode_string: str, reference_year: Optional[int]):
+        self.string = barcode_string
+        self.reference_year = (
+            reference_year if reference_year is not None else current_year()
+        )
+        self.data = None
+        self._number_of_legs = None
+        self._legs = None
+        self._security_position = None
+        self._section_a = None
+        self._section_b = {}
+        self._security = None
+
+    def number_of_legs(self) -> int:
+        if self._number_of_legs is None:
+            field, start, end = _NUMBER_OF_LEGS
+            value = CONVERTERS[field.kind](self.string[start:end], None)
+            self._number_of_legs = value or 0
+        return self._number_of_legs
+
+    def legs(self) -> List[Tuple[int, str]]:
+        """Return (mandatory block position, conditional section) per leg."""
+        if self._legs is None:
+            legs = []
+            position = layout.HEADER_LENGTH
+            for _ in range(self.number_of_legs()):
+                conditional, next_position = split_section(
+                    self.string, position + layout.MANDATORY_LEG_LENGTH
+                )
+                legs.append((position, conditional))
+                position = next_position
+            self._legs = legs
+            self._security_position = position
+        return self._legs
+
+    def conditional(self, index: int = 0) -> str:
+        legs = self.legs()
+        return legs[index][1] if index < len(legs) else ""
+
+    def section_a(self) -> Tuple[str, int]:
+        """Return section A and the offset of the first leg's section B."""
+        if self._section_a is None:
+            self._section_a = split_section(
+                self.conditional(0), _CONDITIONAL_HEADER_LENGTH
+            )
+        return self._section_a
+
+    def section_b(self, index: int) -> Tuple[str, str]:
+        """Return section B and the individual airline use remainder of a leg."""
+        if index not in self._section_b:
+            conditional = self.conditional(index)
+            offset = self.section_a()[1] if index == 0 else 0
+            section, offset = split_section(conditional, offset)
+            self._section_b[index] = (section, conditional[offset:])
+        return self._section_b[index]
+
+    def security_position(self) -> int:
+        self.legs()
+        return self._security_position
+
+    def security(self) -> str:
+        if self._security is None:
+            self._security = split_section(
+                self.string, self.security_position() + _SECURITY_HEADER_LENGTH
+            )[0]
+        return self._security
+
+
+class _Field:
+    """Non-data descriptor that decodes a field once and caches it on the view."""
+
+    __slots__ = ("name", "load")
+
+    def __init__(self, name: str, load: Callable):
+        self.name = name
+        self.load = load
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = view.__dict__[self.name] = self.load(view)
+        return value
+
+
+class _StringField(_Field):
+    """String field read straight from the raw string at the view position."""
+
+    __slots__ = ("start", "end")
+
+    def __init__(self, name: str, start: int, end: int):
+        super().__init__(name, None)
+        self.start = start
+        self.end = end
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        position = view._position
+        value = view.__dict__[self.name] = (
+            view._string[position + self.start : position + self.end].rstrip()
+            or None
+        )
+        return value
+
+
+class _LazyView:
+    """Base for views whose attributes are decoded on first access and cached."""
+
+    def __init__(self, sections: _Sections, position: int = 0):
+        self._sections = sections
+        self._string = sections.string
+        self._reference_year = sections.reference_year
+        # where fields read straight from the raw string start
+        self._position = position
+
+    def _values(self, model) -> dict:
+        return {name: getattr(self, name) for name in model.__dataclass_fields__}
+
+    def __repr__(self) -> str:
+        decoded = ", ".join(
+            f"{name}={value!r}"
+            for name, value in self.__dict__.items()
+            if not name.startswith("_")
+        )
+        return f"{type(self).__name__}({decoded})"
+
+
+def _field(
+    field: layout.Field, start: int, end: int, source: Optional[Callable]
+) -> _Field:
+    """Build the descriptor reading one field from the (string, offset) source gives.
+
+    Without a source, the field is read from the raw string at the view position.
+    """
+    convert = CONVERTERS[field.kind]
+
+    if source is None:
+        if field.kind == layout.STRING:
+            return _StringField(field.name, start, end)
+
+        def load(view):
+            position = view._position
+            return convert(
+                view._string[position + start : position + end], view._reference_year
+            )
+
+    else:
+
+        def load(view):
+            string, offset = source(view)
+            return convert(string[offset + start : offset + end], view._reference_year)
+
+    return _Field(field.name, load)
+
+
+def _install(cls, owner: str, *sections: Tuple[tuple, Optional[Callable]]):
+    """Add a field descriptor to cls for every field of owner in sections."""
+    for section_fields, source in sections:
+        for field, start, end in layout.offsets(section_fields):
+            if field.owner == owner:
+                setattr(cls, field.name, _field(field, start, end, source))
+
+
+def _conditional_header(view):
+    return view._sections.conditional(0), 0
+
+
+def _section_a(view):
+    return view._sections.section_a()[0], 0
+
+
+def _security_header(view):
+    sections = view._sections
+    return sections.string, sections.security_position()
+
+
+def _security(view):
+    return view._sections.security(), 0
+
+
+def _section_b(view):
+    return view._sections.section_b(view._index)[0], 0
+
+
+class LazyLeg(_LazyView):
+    """Leg view over a raw barcode; see Leg for the attributes."""
+
+    def __init__(self, sections: _Sections, index: int, position: int):
+        super().__init__(sections, position)
+        self._index = index
+
+    airline_use = Leg.airline_use
+
+    def _load_date_of_flight(self):
+        date_of_flight = self._raw_date_of_flight(self)
+        date_of_issue = self._sections.data.date_of_issue_of_boarding_pass
+        if date_of_flight is not None and date_of_issue is not None:
+            date_of_flight = adjust_flight_date(date_of_flight, date_of_issue)
+        return date_of_flight
+
+    def _load_for_individual_airline_use(self):
+        return self._sections.section_b(self._index)[1].rstrip() or None
+
+    def materialize(self) -> Leg:
+        """Decode all remaining fields into a Leg."""
+        return Leg(**self._values(Leg))
+
+
+_install(LazyLeg, "leg", (layout.MANDATORY_LEG, None), (layout.SECTION_B, _section_b))
+LazyLeg._raw_date_of_flight = staticmethod(LazyLeg.__dict__["date_of_flight"].load)
+LazyLeg.date_of_flight = _Field("date_of_flight", LazyLeg._load_date_of_flight)
+LazyLeg.for_individual_airline_use = _Field(
+    "for_individual_airline_use", LazyLeg._load_for_individual_airline_use
+)
+
+
+class LazyBoardingPassData(_LazyView):
+    """BoardingPassData view over a raw barcode."""
+
+    def _load_legs(self):
+        sections = self._sections
+        return [
+            LazyLeg(sections, index, position)
+            for index, (position, _) in enumerate(sections.legs())
+        ]
+
+    def materialize(self) -> BoardingPassData:
+        """Decode all remaining fields into a BoardingPassData."""
+        values = self._values(BoardingPassData)
+        values["legs"] = [leg.materialize() for leg in values["legs"]]
+        return BoardingPassData(**values)
+
+
+_install(
+    LazyBoardingPassData,
+    "data",
+    (layout.HEADER, None),
+    (layout.SECTION_A, _section_a),
+    (layout.SECURITY_HEADER, _security_header),
+    (layout.SECURITY, _security),
+)
+LazyBoardingPassData.legs = _Field("legs", LazyBoardingPassData._load_legs)
+
+
+class LazyBoardingPassMetaData(_LazyView):
+    """BoardingPassMetaData view over a raw barcode."""
+
+    def _load_number_of_legs_encoded(self):
+        return self._sections.number_of_legs()
+
+    def materialize(self) -> BoardingPassMetaData:
+        """Decode all remaining fields into a BoardingPassMetaData."""
+        return BoardingPassMetaData(**self._values(BoardingPassMetaData))
+
+
+_install(
+    LazyBoardingPassMetaData,
+    "meta",
+    (layout.HEADER, None),
+    (layout.CONDITIONAL_HEADER, _conditional_header),
+    (layout.SECURITY_HEADER, _security_header),
+)
+LazyBoardingPassMetaData.number_of_legs_encoded = _Field(
+    "number_of_legs_encoded", LazyBoardingPassMetaData._load_number_of_legs_encoded
+)
+
+
+class LazyBoardingPass:
+    """BarcodedBoardingPass view that decodes each field on first access.
+
+    Section boundaries are located only when a field inside them is read, and
+    every decoded value is cached on its view. Malformed input raises when the
+    affected field is read rather than up front. A bytes-like barcode is read
+    in place, and only the fields that are accessed are converted to str.
+    """
+
+    def __init__(
+        self,
+        barcode_string: Union[str, bytes, bytearray, memoryview],
+        reference_year: Optional[int] = None,
+    ):
+        if barcode_string is not None and not isinstance(barcode_string, str):
+            barcode_string = BufferText(barcode_string)
+        sections = _Sections(barcode_string or "", reference_year)
+        self.data = sections.data = LazyBoardingPassData(sections)
+        self.meta = LazyBoardingPassMetaData(sections)
+
+    def materialize(self) -> BarcodedBoardingPass:
+        """Decode all remaining fields into a BarcodedBoardingPass."""
+        return BarcodedBoardingPass(
+            data=self.data.materialize(), meta=self.meta.materialize()
+        )
+
+    def __repr__(self) -> str:
+        return f"LazyBoardingPass(data={self.data!r}, meta={self.meta!r})"
+
+
+def decode_lazy(
+    barcode_string: Union[str, bytes, bytearray, memoryview],
+    reference_year: Optional[int] = None,
+) -> LazyBoardingPass:
+    """Return a lazy view over a BCBP barcode string."""
+    return LazyBoardingPass(barcode_string, reference_year)
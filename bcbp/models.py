@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, make_dataclass
 from datetime import datetime
-from typing import List, Optional
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 class LENGTHS:
@@ -44,8 +45,44 @@ class LENGTHS:
     SECURITY_DATA = 100
 
 
+class _AirlineUse:
+    """Leg mixin parsing for_individual_airline_use once per leg."""
+
+    # (text, parser, record) of the last parse; a slot, so slotted legs have it
+    __slots__ = ("_airline_use",)
+
+    @property
+    def airline_use(self) -> Optional[Tuple]:
+        """for_individual_airline_use parsed with the operating carrier's layout.
+
+        None when the carrier has no layout registered (see bcbp.airline) or
+        the leg carries no airline use data. The record is parsed on first
+        read and kept until the remainder or the carrier's layout changes.
+        """
+        parse = AIRLINE_PARSERS.get(self.operating_carrier_designator)
+        if parse is None:
+            return None
+        text = self.for_individual_airline_use
+        if text is None:
+            return None
+        cached = getattr(self, "_airline_use", None)
+        if cached is not None and cached[1] is parse and cached[0] == text:
+            return cached[2]
+        record = parse(text)
+        self._airline_use = (text, parse, record)
+        return record
+
+    def __getstate__(self) -> dict:
+        # fields only: the cached record's class is built at runtime
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
 @dataclass
-class Leg:
+class Leg(_AirlineUse):
     operating_carrier_pnr_code: Optional[str] = None
     from_city_airport_code: Optional[str] = None
     to_city_airport_code: Optional[str] = None
@@ -69,6 +106,10 @@ class Leg:
     for_individual_airline_use: Optional[str] = None
 
 
+# operating carrier designator -> parser, filled by bcbp.airline.register
+AIRLINE_PARSERS: Dict[str, Callable[[str], Tuple]] = {}
+
+
 @dataclass
 class BoardingPassData:
     legs: Optional[List[Leg]] = None
@@ -100,3 +141,64 @@ class BoardingPassMetaData:
 class BarcodedBoardingPass:
     data: Optional[BoardingPassData] = None
     meta: Optional[BoardingPassMetaData] = None
+
+
+def _slotted(model, name: str):
+    """Build a __slots__ twin of a model dataclass with the same fields."""
+    cls = make_dataclass(
+        name,
+        [(f.name, f.type, field(default=None)) for f in fields(model)],
+        # keeps mixins such as _AirlineUse, whose slots come along
+        bases=model.__bases__,
+        slots=True,
+    )
+    cls.__module__ = __name__  # so instances pickle, e.g. across decode_many workers
+    return cls
+
+
+# compact variants without a per-instance __dict__, for large in-memory pass sets
+CompactLeg = _slotted(Leg, "CompactLeg")
+CompactBoardingPassData = _slotted(BoardingPassData, "CompactBoardingPassData")
+CompactBoardingPassMetaData = _slotted(
+    BoardingPassMetaData, "CompactBoardingPassMetaData"
+)
+CompactBarcodedBoardingPass = _slotted(
+    BarcodedBoardingPass, "CompactBarcodedBoardingPass"
+)
+
+# (pass, data, meta, leg) classes that decoders build
+MODELS = (BarcodedBoardingPass, BoardingPassData, BoardingPassMetaData, Leg)
+COMPACT_MODELS = (
+    CompactBarcodedBoardingPass,
+    CompactBoardingPassData,
+    CompactBoardingPassMetaData,
+    CompactLeg,
+)
+
+
+_LEG_VALUES = attrgetter(*(f.name for f in fields(Leg)))
+_DATA_VALUES = attrgetter(*(f.name for f in fields(BoardingPassData)[1:]))
+_META_VALUES = attrgetter(*(f.name for f in fields(BoardingPassMetaData)))
+
+
+def _convert(bcbp, models):
+    pass_model, data_model, meta_model, leg_model = models
+    data = meta = None
+    if bcbp.data is not None:
+        legs = bcbp.data.legs
+        if legs is not None:
+            legs = [leg_model(*_LEG_VALUES(leg)) for leg in legs]
+        data = data_model(legs, *_DATA_VALUES(bcbp.data))
+    if bcbp.meta is not None:
+        meta = meta_model(*_META_VALUES(bcbp.meta))
+    return pass_model(data=data, meta=meta)
+
+
+def to_compact(bcbp: BarcodedBoardingPass) -> "CompactBarcodedBoardingPass":
+    """Convert a BarcodedBoardingPass to its compact __slots__ form."""
+    return _convert(bcbp, COMPACT_MODELS)
+
+
+def from_compact(bcbp: "CompactBarcodedBoardingPass") -> BarcodedBoardingPass:
+    """Convert a compact pass back to the regular dataclasses."""
+    return _convert(bcbp, MODELS)
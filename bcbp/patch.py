@@ -0,0 +1,167 @@
+from datetime import datetime
+from typing import Dict, Union
+
+from . import layout
+from .encode import _format_field, _sized
+from .models import LENGTHS
+from .utils import bytes_to_string, hex_to_number
+
+_MANDATORY = {entry[0].name: entry for entry in layout.offsets(layout.MANDATORY_LEG)}
+_HEADER = {
+    entry[0].name: entry
+    for entry in layout.offsets(layout.HEADER)
+    if entry[0].owner == "data"
+}
+_SECTION_A = frozenset(field.name for field in layout.SECTION_A)
+_SECTION_B = frozenset(field.name for field in layout.SECTION_B)
+_REMAINDER = "for_individual_airline_use"
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SIZE = layout.SECTION_SIZE_LENGTH
+
+# zero-filled by encode before padding
+_ZERO_FILL = {
+    "flight_number": LENGTHS.FLIGHT_NUMBER - 1,
+    "seat_number": LENGTHS.SEAT_NUMBER,
+    "check_in_sequence_number": LENGTHS.CHECK_IN_SEQUENCE_NUMBER - 1,
+}
+
+Value = Union[str, int, bool, datetime, None]
+
+
+def _splice(string: str, start: int, end: int, value: str) -> str:
+    return string[:start] + value + string[end:]
+
+
+def _fixed(field: layout.Field, value: Value) -> str:
+    if field.name in _ZERO_FILL:
+        value = value.zfill(_ZERO_FILL[field.name])
+    return _format_field(value, field.length, field.kind == layout.DATE_WITH_YEAR)
+
+
+def _read_size(string: str, position: int) -> int:
+    return hex_to_number(string[position : position + _SIZE])
+
+
+def _patch_section(section: str, section_fields, changes: Dict[str, Value]) -> str:
+    """Rewrite a sized section with changes, as encode would write it.
+
+    Unchanged fields keep their raw text and count as defined when not blank,
+    which is how they decode.
+    """
+    parts = []
+    defined_end = 0
+    for field, start, end in layout.offsets(section_fields):
+        if field.name in changes:
+            value = changes[field.name]
+            text = _format_field(
+                value, field.length, field.kind == layout.DATE_WITH_YEAR
+            )
+            defined = value is not None
+        else:
+            text = section[start:end].ljust(field.length)
+            defined = bool(text.rstrip())
+        parts.append(text)
+        if defined:
+            defined_end = end
+    return _sized("".join(parts), defined_end)
+
+
+def patch(
+    barcode_string: Union[str, bytes, bytearray, memoryview],
+    leg: int = 0,
+    **fields: Value,
+) -> str:
+    """Return barcode_string with some fields replaced, without a full decode.
+
+    Fields are named like the model attributes. Leg fields are changed on the
+    given leg; passenger_name and the section A fields belong to the whole
+    pass. Mandatory fields are spliced in place, and conditional fields only
+    rewrite their own section and the size prefixes around it. For a barcode
+    written by encode, the result is the same as decoding, changing the fields
+    and encoding again.
+    """
+    s = bytes_to_string(barcode_string)
+    for name in fields:
+        if not (
+            name in _MANDATORY
+            or name in _HEADER
+            or name in _SECTION_A
+            or name in _SECTION_B
+            or name == _REMAINDER
+        ):
+            raise ValueError(f"cannot patch field {name!r}")
+
+    number_of_legs = int(s[1:2] or 0)
+    if not 0 <= leg < number_of_legs:
+        raise IndexError(f"leg {leg} out of range for {number_of_legs} legs")
+
+    for name, value in fields.items():
+        if name in _HEADER:
+            field, start, end = _HEADER[name]
+            s = _splice(s, start, end, _fixed(field, value))
+
+    # section A lives in the first leg's conditional section
+    section_a = {name: value for name, value in fields.items() if name in _SECTION_A}
+    if section_a and leg != 0:
+        s = _patch_leg(s, 0, {}, section_a)
+        section_a = {}
+    return _patch_leg(s, leg, fields, section_a)
+
+
+def _patch_leg(
+    s: str, leg: int, fields: Dict[str, Value], section_a: Dict[str, Value]
+) -> str:
+    position = layout.HEADER_LENGTH
+    for _ in range(leg):
+        position += layout.MANDATORY_LEG_LENGTH
+        position += _SIZE + _read_size(s, position)
+
+    for name, value in fields.items():
+        if name in _MANDATORY:
+            field, start, end = _MANDATORY[name]
+            s = _splice(s, position + start, position + end, _fixed(field, value))
+
+    section_b = {name: value for name, value in fields.items() if name in _SECTION_B}
+    if not (section_a or section_b or _REMAINDER in fields):
+        return s
+
+    start = position + layout.MANDATORY_LEG_LENGTH
+    size = _read_size(s, start)
+    if size == 0:
+        raise ValueError(f"leg {leg} has no conditional section to patch")
+    end = start + _SIZE + size
+    conditional = s[start + _SIZE : end]
+
+    parts = []
+    offset = 0
+    if leg == 0:
+        offset = _CONDITIONAL_HEADER_LENGTH
+        end_a = offset + _SIZE + _read_size(conditional, offset)
+        parts.append(conditional[:offset])
+        if section_a:
+            parts.append(
+                _patch_section(
+                    conditional[offset + _SIZE : end_a], layout.SECTION_A, section_a
+                )
+            )
+        else:
+            parts.append(conditional[offset:end_a])
+        offset = end_a
+
+    end_b = offset + _SIZE + _read_size(conditional, offset)
+    if section_b:
+        parts.append(
+            _patch_section(
+                conditional[offset + _SIZE : end_b], layout.SECTION_B, section_b
+            )
+        )
+    else:
+        parts.append(conditional[offset:end_b])
+
+    if _REMAINDER in fields:
+        parts.append(_format_field(fields[_REMAINDER]))
+    else:
+        parts.append(conditional[end_b:])
+
+    conditional = "".join(parts)
+    return s[:start] + _sized(conditional, len(conditional)) + s[end:]
@@ -0,0 +1,220 @@
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple, Union
+
+from . import layout
+from .engine import (
+    CONVERTERS,
+    adjust_flight_date,
+    compile_reader,
+    skip_section,
+    split_section,
+)
+from .models import (
+    MODELS,
+    BarcodedBoardingPass,
+    BoardingPassData,
+    BoardingPassMetaData,
+    Leg,
+)
+from .utils import bytes_to_string, current_year
+
+_LEG_FIELDS = frozenset(field.name for field in dataclass_fields(Leg))
+_DATA_FIELDS = frozenset(field.name for field in dataclass_fields(BoardingPassData))
+_META_FIELDS = frozenset(field.name for field in dataclass_fields(BoardingPassMetaData))
+_NUMBER_OF_LEGS = layout.offsets(layout.HEADER)[1]
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+
+
+def _names(section_fields, names) -> list:
+    return [field.name for field in section_fields if field.name in names]
+
+
+class Projection:
+    """A compiled set of fields to decode, reusable across calls.
+
+    Fields are named like the model attributes: "legs.<Leg field>" for leg
+    fields, and "<field>" (optionally "data.<field>" or "meta.<field>") for
+    BoardingPassData and BoardingPassMetaData fields. Sections holding none of
+    the requested fields are skipped, and the walk stops once nothing further
+    is needed. Fields not requested are left as None.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        leg_names = set()
+        names = set()
+        for path in fields:
+            if path.startswith("legs."):
+                name = path[len("legs.") :]
+                if name not in _LEG_FIELDS:
+                    raise ValueError(f"unknown field {path!r}")
+                leg_names.add(name)
+            else:
+                name = path.split(".", 1)[1] if path[:5] in ("data.", "meta.") else path
+                if name == "legs" or name not in _DATA_FIELDS | _META_FIELDS:
+                    raise ValueError(f"unknown field {path!r}")
+                names.add(name)
+        self.fields = frozenset(leg_names | names)
+        self._leg_names = leg_names
+        self._names = names
+
+        # flight dates depend on the issuance date, so read it when they are asked
+        self._adjust_dates = "date_of_flight" in leg_names
+        section_a = names | (
+            {"date_of_issue_of_boarding_pass"} if self._adjust_dates else set()
+        )
+
+        self._header = _names(layout.HEADER, names)
+        self._read_header = compile_reader(layout.HEADER, names)
+        self._mandatory = _names(layout.MANDATORY_LEG, leg_names)
+        self._read_mandatory = compile_reader(layout.MANDATORY_LEG, leg_names)
+        self._conditional_header = _names(layout.CONDITIONAL_HEADER, names)
+        self._read_conditional_header = compile_reader(
+            layout.CONDITIONAL_HEADER, names
+        )
+        self._section_a = _names(layout.SECTION_A, section_a)
+        self._read_section_a = compile_reader(layout.SECTION_A, section_a)
+        self._section_b = _names(layout.SECTION_B, leg_names)
+        self._read_section_b = compile_reader(layout.SECTION_B, leg_names)
+        self._remainder = "for_individual_airline_use" in leg_names
+        self._security_header = _names(layout.SECURITY_HEADER, names)
+        self._read_security_header = compile_reader(layout.SECURITY_HEADER, names)
+        self._security = "security_data" in names
+
+        # which parts of the string the walk has to visit
+        self._leg_conditional = bool(self._section_b or self._remainder)
+        self._first_conditional = bool(
+            self._conditional_header or self._section_a or self._leg_conditional
+        )
+        self._needs_security = bool(self._security_header or self._security)
+        self._all_legs = bool(leg_names or self._needs_security)
+        self._walk = self._all_legs or self._first_conditional
+
+    def __repr__(self) -> str:
+        return f"Projection({sorted(self.fields)!r})"
+
+    def decode(
+        self,
+        barcode_string: Union[str, bytes, bytearray, memoryview],
+        reference_year: Optional[int] = None,
+        models: Tuple[type, type, type, type] = MODELS,
+    ) -> BarcodedBoardingPass:
+        """Decode only the projected fields of a BCBP barcode string."""
+        pass_model, data_model, meta_model, leg_model = models
+        s = bytes_to_string(barcode_string) or ""
+        if reference_year is None:
+            reference_year = current_year()
+        values = dict(zip(self._header, self._read_header(s, 0, reference_year)))
+        if "number_of_legs_encoded" in values:
+            values["number_of_legs_encoded"] = values["number_of_legs_encoded"] or 0
+
+        legs = [] if self._leg_names else None
+        if self._walk:
+            field, start, end = _NUMBER_OF_LEGS
+            number_of_legs = CONVERTERS[field.kind](s[start:end], None) or 0
+            if not self._all_legs:
+                number_of_legs = min(number_of_legs, 1)
+
+            date_of_issue = None
+            position = layout.HEADER_LENGTH
+            for leg_index in range(number_of_legs):
+                leg = dict(
+                    zip(
+                        self._mandatory,
+                        self._read_mandatory(s, position, reference_year),
+                    )
+                )
+                position += layout.MANDATORY_LEG_LENGTH
+                first = leg_index == 0
+                if not (self._first_conditional if first else self._leg_conditional):
+                    position = skip_section(s, position)
+                    if legs is not None:
+                        legs.append(leg)
+                    continue
+
+                conditional, position = split_section(s, position)
+                offset = 0
+                if first:
+                    values.update(
+                        zip(
+                            self._conditional_header,
+                            self._read_conditional_header(
+                                conditional, 0, reference_year
+                            ),
+                        )
+                    )
+                    if self._section_a:
+                        section, offset = split_section(
+                            conditional, _CONDITIONAL_HEADER_LENGTH
+                        )
+                        section_a = dict(
+                            zip(
+                                self._section_a,
+                                self._read_section_a(section, 0, reference_year),
+                            )
+                        )
+                        date_of_issue = section_a.get("date_of_issue_of_boarding_pass")
+                        values.update(
+                            (name, value)
+                            for name, value in section_a.items()
+                            if name in self._names
+                        )
+                    else:
+                        offset = skip_section(conditional, _CONDITIONAL_HEADER_LENGTH)
+
+                if self._section_b:
+                    section, offset = split_section(conditional, offset)
+                    leg.update(
+                        zip(
+                            self._section_b,
+                            self._read_section_b(section, 0, reference_year),
+                        )
+                    )
+                elif self._remainder:
+                    offset = skip_section(conditional, offset)
+                if self._remainder:
+                    leg["for_individual_airline_use"] = (
+                        conditional[offset:].rstrip() or None
+                    )
+                if legs is not None:
+                    legs.append(leg)
+
+            if self._adjust_dates and date_of_issue is not None:
+                for leg in legs:
+                    if leg["date_of_flight"] is not None:
+                        leg["date_of_flight"] = adjust_flight_date(
+                            leg["date_of_flight"], date_of_issue
+                        )
+
+            if self._needs_security:
+                values.update(
+                    zip(
+                        self._security_header,
+                        self._read_security_header(s, position, reference_year),
+                    )
+                )
+                if self._security:
+                    section, _ = split_section(s, position + _SECURITY_HEADER_LENGTH)
+                    values["security_data"] = (
+                        section[: layout.LENGTHS.SECURITY_DATA].rstrip() or None
+                    )
+
+        data = data_model(
+            legs=None if legs is None else [leg_model(**leg) for leg in legs],
+            **{name: value for name, value in values.items() if name in _DATA_FIELDS},
+        )
+        meta = meta_model(
+            **{name: value for name, value in values.items() if name in _META_FIELDS}
+        )
+        return pass_model(data=data, meta=meta)
+
+
+@lru_cache(maxsize=128)
+def _cached_projection(fields: FrozenSet[str]) -> Projection:
+    return Projection(fields)
+
+
+def compile_projection(fields: Iterable[str]) -> Projection:
+    """Return a compiled Projection for fields, reusing earlier compilations."""
+    return _cached_projection(frozenset(fields))
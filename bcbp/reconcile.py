@@ -0,0 +1,297 @@
+"""Sharded reconciliation of gate and security scan logs across processes.
+
+The job runs in two parallel passes over a temporary directory:
+
+1. Each input log is split into byte ranges on line boundaries. A worker
+   decodes only the PNR, carrier, flight number and flight date of every
+   leg in its range and appends the leg's boarding key to one spill file per
+   shard, picked by a hash of the key.
+2. A worker per shard counts that shard's keys from gate and from security
+   and reports keys seen at one checkpoint only, and keys boarded more than
+   once at the gate.
+
+Memory per worker is bounded by the distinct keys of one shard, which
+shard_bytes sets, whatever the size of the logs. The per-shard findings are
+merged and sorted at the end.
+"""
+import os
+import re
+import time
+import zlib
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .index import BoardingKey, _complete, _day, _flight_number, _strip
+from .projection import Projection
+from .scanlog import iter_records
+from .utils import current_year
+
+GATE = "gate"
+SECURITY = "security"
+
+Path = Union[str, os.PathLike]
+
+# spill lines are tab-separated key fields, so junk scans holding a tab or
+# newline in a field must not split it
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n"})
+_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n"}
+_ESCAPED = re.compile(r"\\(.)")
+
+# key bytes a partition worker holds before appending them to the shard files
+_SPILL_BYTES = 4 << 20
+
+_PROJECTION = Projection(
+    (
+        "legs.operating_carrier_pnr_code",
+        "legs.operating_carrier_designator",
+        "legs.flight_number",
+        "legs.date_of_flight",
+    )
+)
+
+
+class Reconciliation(NamedTuple):
+    gate_only: List[BoardingKey]
+    security_only: List[BoardingKey]
+    duplicate_boardings: List[Tuple[BoardingKey, int]]
+    records: int
+    legs: int
+    # legs missing a key part, left out of the matching
+    incomplete: int
+    errors: int
+    bytes: int
+    seconds: float
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+# (checkpoint, path, start, stop) of one range of a log
+_Range = Tuple[str, str, int, int]
+
+
+def _ranges(checkpoint: str, path: Path, chunk_bytes: int) -> List[_Range]:
+    """Split a log into byte ranges of about chunk_bytes ending at newlines."""
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as file:
+        while start < size:
+            stop = start + chunk_bytes
+            if stop < size:
+                file.seek(stop)
+                file.readline()
+                stop = file.tell()
+            stop = min(stop, size)
+            ranges.append((checkpoint, path, start, stop))
+            start = stop
+    return ranges
+
+
+def _shard_path(directory: str, shard: int, checkpoint: str, chunk: int) -> str:
+    return os.path.join(directory, f"{shard}.{checkpoint}.{chunk}")
+
+
+def _spill(
+    buffers: dict, directory: str, checkpoint: str, chunk: int, spilled: set
+):
+    spilled.update(buffers)
+    for shard, lines in buffers.items():
+        with open(_shard_path(directory, shard, checkpoint, chunk), "ab") as file:
+            file.write(b"".join(lines))
+    buffers.clear()
+
+
+def _partition(
+    chunk: int,
+    log_range: _Range,
+    shards: int,
+    directory: str,
+    reference_year: int,
+) -> Tuple[int, int, int, int, List[int]]:
+    """Spill the boarding keys of a log range to shard files.
+
+    Returns the (records, legs, incomplete, errors) counts of the range and
+    the shards it wrote a file for.
+    """
+    checkpoint, path, start, stop = log_range
+    decode = _PROJECTION.decode
+    # shard -> key lines not yet written, flushed every _SPILL_BYTES
+    buffers = {}
+    buffered = 0
+    spilled = set()
+    records = legs = incomplete = errors = 0
+    for record in iter_records(path, start, stop):
+        records += 1
+        try:
+            bcbp_legs = decode(record, reference_year).data.legs
+        except Exception:
+            errors += 1
+            continue
+        for leg in bcbp_legs:
+            legs += 1
+            boarding = (
+                _strip(leg.operating_carrier_pnr_code),
+                _strip(leg.operating_carrier_designator),
+                _flight_number(leg.flight_number),
+                _day(leg.date_of_flight),
+            )
+            if not _complete(boarding):
+                incomplete += 1
+                continue
+            pnr, carrier, flight_number, day = boarding
+            line = "\t".join(
+                (
+                    pnr.translate(_ESCAPES),
+                    carrier.translate(_ESCAPES),
+                    flight_number.translate(_ESCAPES),
+                    str(day),
+                )
+            )
+            line = f"{line}\n".encode()
+            # crc32 rather than hash(), which differs between processes
+            buffers.setdefault(zlib.crc32(line) % shards, []).append(line)
+            buffered += len(line)
+            if buffered > _SPILL_BYTES:
+                _spill(buffers, directory, checkpoint, chunk, spilled)
+                buffered = 0
+    _spill(buffers, directory, checkpoint, chunk, spilled)
+    return records, legs, incomplete, errors, sorted(spilled)
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return _ESCAPED.sub(lambda match: _UNESCAPES[match.group(1)], value)
+
+
+def _boarding_key(line: bytes) -> BoardingKey:
+    pnr, carrier, flight_number, day = line.decode().rstrip("\n").split("\t")
+    return _unescape(pnr), _unescape(carrier), _unescape(flight_number), int(day)
+
+
+def _reconcile_shard(
+    shard: int, directory: str, chunks: List[Tuple[int, str]]
+) -> Tuple[List[BoardingKey], List[BoardingKey], List[Tuple[BoardingKey, int]]]:
+    """Count the keys of one shard at each checkpoint and return its findings.
+
+    chunks lists the (chunk, checkpoint) of the ranges that spilled to the shard.
+    """
+    # raw key line -> [gate count, security count]
+    counts = {}
+    for chunk, checkpoint in chunks:
+        path = _shard_path(directory, shard, checkpoint, chunk)
+        column = 0 if checkpoint == GATE else 1
+        with open(path, "rb") as file:
+            for line in file:
+                pair = counts.get(line)
+                if pair is None:
+                    pair = counts[line] = [0, 0]
+                pair[column] += 1
+        os.remove(path)
+
+    gate_only = []
+    security_only = []
+    duplicates = []
+    for line, (gate, security) in counts.items():
+        if not security:
+            gate_only.append(_boarding_key(line))
+        elif not gate:
+            security_only.append(_boarding_key(line))
+        if gate > 1:
+            duplicates.append((_boarding_key(line), gate))
+    return gate_only, security_only, duplicates
+
+
+def reconcile(
+    gate_logs: Iterable[Path],
+    security_logs: Iterable[Path],
+    workers: Optional[int] = None,
+    reference_year: Optional[int] = None,
+    shard_bytes: int = 64 << 20,
+    chunk_bytes: int = 32 << 20,
+    temp_dir: Optional[Path] = None,
+) -> Reconciliation:
+    """Reconcile the boarding pass scan logs of gates and security lanes.
+
+    Legs are matched on PNR, operating carrier, flight number and flight date,
+    compared as PassIndex does. Finds legs scanned at the gate but never at
+    security and the reverse, and legs boarded more than once. Legs missing
+    any of those parts are only counted, as incomplete, and records that fail
+    to decode are counted as errors; both are otherwise skipped.
+
+    workers defaults to the CPU count; with one worker everything runs
+    in-process. Logs are read chunk_bytes at a time, and there is one shard
+    per shard_bytes of input, with at least four per worker so they balance.
+    Spill files go to a temporary directory under temp_dir.
+    """
+    # imported here as only this job needs them
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from contextlib import ExitStack
+
+    start = time.perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if reference_year is None:
+        # resolve once so every worker uses the same year
+        reference_year = current_year()
+
+    logs = [(GATE, path) for path in gate_logs]
+    logs += [(SECURITY, path) for path in security_logs]
+    total = sum(os.path.getsize(path) for _, path in logs)
+    # enough ranges to keep every worker busy, but not less than 1 MiB each
+    chunk_bytes = max(min(chunk_bytes, total // (workers * 4) + 1), 1 << 20)
+    log_ranges = [
+        log_range
+        for checkpoint, path in logs
+        for log_range in _ranges(checkpoint, path, chunk_bytes)
+    ]
+    shards = max(total // shard_bytes + 1, workers * 4 if workers > 1 else 1)
+
+    with tempfile.TemporaryDirectory(prefix="bcbp-", dir=temp_dir) as directory:
+        count = len(log_ranges)
+        partition_arguments = (
+            range(count),
+            log_ranges,
+            [shards] * count,
+            [directory] * count,
+            [reference_year] * count,
+        )
+        with ExitStack() as stack:
+            if workers <= 1:
+                run = map
+            else:
+                run = stack.enter_context(ProcessPoolExecutor(workers)).map
+            partitions = list(run(_partition, *partition_arguments))
+            # each shard reads only the files the ranges report writing
+            chunks = [[] for _ in range(shards)]
+            for chunk, log_range in enumerate(log_ranges):
+                for shard in partitions[chunk][4]:
+                    chunks[shard].append((chunk, log_range[0]))
+            shard_arguments = (range(shards), [directory] * shards, chunks)
+            findings = list(run(_reconcile_shard, *shard_arguments))
+
+    gate_only = sorted(key for found in findings for key in found[0])
+    security_only = sorted(key for found in findings for key in found[1])
+    duplicates = sorted(item for found in findings for item in found[2])
+    records, legs, incomplete, errors = (
+        sum(column)
+        for column in zip((0, 0, 0, 0), *(partition[:4] for partition in partitions))
+    )
+    return Reconciliation(
+        gate_only,
+        security_only,
+        duplicates,
+        records,
+        legs,
+        incomplete,
+        errors,
+        total,
+        time.perf_counter() - start,
+    )
@@ -0,0 +1,71 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+from .decode import decode
+from .lazy import LazyBoardingPass
+from .models import BarcodedBoardingPass
+
+
+@contextmanager
+def _mapped(path: Union[str, os.PathLike]):
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            # records handed out are still alive; the map closes with them
+            pass
+
+
+def iter_records(
+    path: Union[str, os.PathLike], start: int = 0, stop: Optional[int] = None
+) -> Iterator[memoryview]:
+    """Yield each non-empty line of a scan log as a memoryview into the file.
+
+    The file is memory-mapped, so records are not copied and memory use does
+    not grow with the file size. A trailing carriage return is dropped. With
+    start and stop, only the lines beginning in that byte range are read;
+    start should be 0 or just after a newline.
+    """
+    with _mapped(path) as view:
+        data = view.obj
+        size = len(view) if stop is None else min(stop, len(view))
+        while start < size:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(view)
+            last = end
+            if last > start and data[last - 1] == 0x0D:
+                last -= 1
+            if last > start:
+                yield view[start:last]
+            start = end + 1
+
+
+def read_scan_log(
+    path: Union[str, os.PathLike],
+    reference_year: Optional[int] = None,
+    lazy: bool = True,
+) -> Iterator[Union[LazyBoardingPass, BarcodedBoardingPass]]:
+    """Decode every record of a newline-delimited scan log.
+
+    With lazy=True (the default) each record is yielded as a LazyBoardingPass
+    reading straight from the mapped file, so only accessed fields become str;
+    call materialize() on any pass that must outlive the iteration. With
+    lazy=False each record is fully decoded with decode.
+    """
+    for record in iter_records(path):
+        if lazy:
+            yield LazyBoardingPass(record, reference_year)
+        else:
+            yield decode(record, reference_year)
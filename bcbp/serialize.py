@@ -0,0 +1,217 @@
+"""Dict and JSON serialization of the model classes.
+
+The converters are generated once per option set as flat functions, one per
+model class, so a call does no reflection and no deep copying the way
+dataclasses.asdict does.
+"""
+import json
+from dataclasses import fields
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+from . import layout
+from .engine import _date, adjust_flight_dates
+from .models import COMPACT_MODELS, MODELS, BarcodedBoardingPass
+from .utils import current_year, date_to_day_of_year
+
+# date representations
+ISO = "iso"  # "2024-03-05"
+JULIAN = "julian"  # day of year as in the barcode, "065" or "4065" with year digit
+
+_NESTED = {
+    "data": "_data({0})",
+    "meta": "_meta({0})",
+    "legs": "[_leg(leg) for leg in {0}]",
+}
+_TO_VALUE = {
+    (ISO, layout.DATE): "{0}.date().isoformat()",
+    (ISO, layout.DATE_WITH_YEAR): "{0}.date().isoformat()",
+    (JULIAN, layout.DATE): "_day_of_year({0})",
+    (JULIAN, layout.DATE_WITH_YEAR): "_day_of_year({0}, True)",
+}
+_FROM_VALUE = {
+    (ISO, layout.DATE): "_from_iso({0})",
+    (ISO, layout.DATE_WITH_YEAR): "_from_iso({0})",
+    (JULIAN, layout.DATE): "_date({0}, False, reference_year)",
+    (JULIAN, layout.DATE_WITH_YEAR): "_date({0}, True, reference_year)",
+}
+
+
+def _from_iso(value: str) -> datetime:
+    result = datetime.fromisoformat(value)
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=timezone.utc)
+    return result
+
+
+def _check_dates(dates: str):
+    if dates not in (ISO, JULIAN):
+        raise ValueError(f"unknown date representation {dates!r}")
+
+
+def _to_expression(name: str, dates: str) -> Optional[str]:
+    """Return the expression converting {0} to a plain value, None if as is."""
+    if name in _NESTED:
+        return _NESTED[name]
+    return _TO_VALUE.get((dates, layout.KINDS.get(name)))
+
+
+def _compile_to_dict(model, omit_none: bool, dates: str, namespace: dict):
+    lines = ["def to_dict(o):"]
+    if omit_none:
+        lines.append("    d = {}")
+    items = []
+    for field in fields(model):
+        name = field.name
+        expression = _to_expression(name, dates)
+        if omit_none:
+            lines.append(f"    v = o.{name}")
+            lines.append("    if v is not None:")
+            value = "v" if expression is None else expression.format("v")
+            lines.append(f"        d[{name!r}] = {value}")
+        elif expression is None:
+            items.append(f"        {name!r}: o.{name},")
+        else:
+            lines.append(f"    {name} = o.{name}")
+            value = expression.format(name)
+            items.append(f"        {name!r}: None if {name} is None else {value},")
+    if omit_none:
+        lines.append("    return d")
+    else:
+        lines += ["    return {", *items, "    }"]
+    exec("\n".join(lines), namespace)
+    return namespace.pop("to_dict")
+
+
+@lru_cache(maxsize=None)
+def _to_dict_functions(omit_none: bool, dates: str) -> dict:
+    """Return {model class: to_dict function} for regular and compact models."""
+    _check_dates(dates)
+    namespace = {"_day_of_year": date_to_day_of_year}
+    functions = {}
+    # the functions share namespace, so nested ones are found at call time
+    for key, model, compact in zip(
+        ("_pass", "_data", "_meta", "_leg"), MODELS, COMPACT_MODELS
+    ):
+        function = _compile_to_dict(model, omit_none, dates, namespace)
+        namespace[key] = function
+        functions[model] = functions[compact] = function
+    return functions
+
+
+@lru_cache(maxsize=None)
+def _compile_from_dict(models: Tuple[type, type, type, type], dates: str):
+    _check_dates(dates)
+    namespace = {"_from_iso": _from_iso, "_date": _date}
+    lines = []
+    for key, model, cls in zip(("pass", "data", "meta", "leg"), MODELS, models):
+        namespace[f"_{key}_model"] = cls
+        lines.append(f"def _{key}(d, reference_year):")
+        lines.append("    get = d.get")
+        arguments = []
+        for field in fields(model):
+            name = field.name
+            expression = _FROM_VALUE.get((dates, layout.KINDS.get(name)))
+            if name in ("data", "meta"):
+                lines.append(f"    {name} = get({name!r})")
+                arguments.append(
+                    f"None if {name} is None else _{name}({name}, reference_year)"
+                )
+            elif name == "legs":
+                lines.append("    legs = get('legs')")
+                arguments.append(
+                    "None if legs is None else"
+                    " [_leg(leg, reference_year) for leg in legs]"
+                )
+            elif expression is None:
+                arguments.append(f"get({name!r})")
+            else:
+                lines.append(f"    {name} = get({name!r})")
+                value = expression.format(name)
+                arguments.append(f"None if {name} is None else {value}")
+        lines.append(f"    return _{key}_model(")
+        lines += [f"        {argument}," for argument in arguments]
+        lines.append("    )")
+    exec("\n".join(lines), namespace)
+    return namespace["_pass"]
+
+
+def to_dict(obj, omit_none: bool = False, dates: str = ISO) -> dict:
+    """Convert a pass, or its data, meta or a leg, to plain dicts and lists.
+
+    Dates become ISO calendar dates or, with dates=JULIAN, day-of-year strings
+    as the barcode carries them. With omit_none, None fields are left out.
+    Compact models are accepted too.
+    """
+    return _to_dict_functions(omit_none, dates)[type(obj)](obj)
+
+
+def to_json(obj, omit_none: bool = False, dates: str = ISO) -> str:
+    """Convert a pass, or its data, meta or a leg, to a compact JSON string."""
+    return json.dumps(to_dict(obj, omit_none, dates), separators=(",", ":"))
+
+
+def from_dict(
+    value: dict,
+    models: Tuple[type, type, type, type] = MODELS,
+    dates: str = ISO,
+    reference_year: Optional[int] = None,
+) -> BarcodedBoardingPass:
+    """Build a pass from the output of to_dict, using the given model classes.
+
+    Missing keys become None. Julian dates are resolved like decode does:
+    against reference_year, then flight dates against the issuance date.
+    """
+    if dates == JULIAN and reference_year is None:
+        reference_year = current_year()
+    bcbp = _compile_from_dict(models, dates)(value, reference_year)
+    if dates == JULIAN and bcbp.data is not None and bcbp.data.legs is not None:
+        adjust_flight_dates(bcbp.data)
+    return bcbp
+
+
+def from_json(
+    string: str,
+    models: Tuple[type, type, type, type] = MODELS,
+    dates: str = ISO,
+    reference_year: Optional[int] = None,
+) -> BarcodedBoardingPass:
+    """Build a pass from the output of to_json."""
+    return from_dict(json.loads(string), models, dates, reference_year)
+
+
+def write_jsonl(
+    passes: Iterable[BarcodedBoardingPass],
+    file: IO[str],
+    omit_none: bool = False,
+    dates: str = ISO,
+    batch_size: int = 512,
+) -> int:
+    """Write one JSON line per pass to a text file and return the count.
+
+    Lines are joined and written batch_size passes at a time.
+    """
+    convert = _to_dict_functions(omit_none, dates)
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    passes = iter(passes)
+    count = 0
+    while True:
+        batch = list(islice(passes, batch_size))
+        if not batch:
+            return count
+        file.write("".join(encode(convert[type(p)](p)) + "\n" for p in batch))
+        count += len(batch)
+
+
+def read_jsonl(
+    file: IO[str],
+    models: Tuple[type, type, type, type] = MODELS,
+    dates: str = ISO,
+    reference_year: Optional[int] = None,
+) -> Iterator[BarcodedBoardingPass]:
+    """Yield the passes of a JSON lines file, skipping blank lines."""
+    for line in file:
+        if line.strip():
+            yield from_dict(json.loads(line), models, dates, reference_year)
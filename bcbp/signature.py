@@ -0,0 +1,265 @@
+"""Verification of the issuing airline's signature in the security section.
+
+The signature covers the barcode from the format code up to, but not
+including, the beginning of security data marker. That payload is sliced
+from the scanned string as is, so it is never rebuilt by encoding a pass.
+The signature algorithm is left to a backend; HMACBackend is a stdlib one
+for local test keys.
+"""
+import base64
+import hmac
+import time
+from collections import OrderedDict
+from enum import IntEnum
+from threading import Lock
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Union
+
+from . import layout
+from .engine import compile_reader, skip_section, split_section
+from .utils import bytes_to_string
+
+_read_number_of_legs = compile_reader(layout.HEADER, names={"number_of_legs_encoded"})
+_read_issuer = compile_reader(
+    layout.SECTION_A, names={"airline_designator_of_boarding_pass_issuer"}
+)
+_read_security_header = compile_reader(layout.SECURITY_HEADER)
+_read_security = compile_reader(layout.SECURITY)
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+
+
+class SignedParts(NamedTuple):
+    payload: str
+    issuer: Optional[str]
+    type_of_security_data: Optional[str]
+    security_data: Optional[str]
+
+
+def signed_parts(
+    barcode_string: Union[str, bytes, bytearray, memoryview]
+) -> SignedParts:
+    """Split a barcode into its signed payload, issuer and security data.
+
+    Only the section sizes, the issuer designator and the security section
+    are read. Raises like decode on barcodes it cannot walk.
+    """
+    s = bytes_to_string(barcode_string) or ""
+    (number_of_legs,) = _read_number_of_legs(s, 0, None)
+    issuer = None
+    position = layout.HEADER_LENGTH
+    for leg_index in range(number_of_legs or 0):
+        position += layout.MANDATORY_LEG_LENGTH
+        if leg_index == 0:
+            conditional, _ = split_section(s, position)
+            section, _ = split_section(conditional, _CONDITIONAL_HEADER_LENGTH)
+            if section:
+                (issuer,) = _read_issuer(section, 0, None)
+        position = skip_section(s, position)
+
+    _, type_of_security_data = _read_security_header(s, position, None)
+    section, _ = split_section(s, position + _SECURITY_HEADER_LENGTH)
+    (security_data,) = _read_security(section, 0, None)
+    return SignedParts(s[:position], issuer, type_of_security_data, security_data)
+
+
+class HMACBackend:
+    """Keyed-hash signatures, for test key stores.
+
+    Keys are shared secrets and signatures are the base64 digest of the
+    payload's latin-1 bytes. Any object with the same load_key and verify
+    methods can be used instead, e.g. one wrapping a public key library.
+    """
+
+    def __init__(self, digest: str = "sha256"):
+        self.digest = digest
+
+    def load_key(self, material: Union[str, bytes]) -> bytes:
+        """Turn key store material into the key verify takes."""
+        return material.encode() if isinstance(material, str) else bytes(material)
+
+    def sign(self, key: bytes, payload: str) -> str:
+        """Return the signature of payload under key."""
+        digest = hmac.new(key, payload.encode("latin-1"), self.digest).digest()
+        return base64.b64encode(digest).decode("ascii")
+
+    def verify(self, key: bytes, payload: str, signature: str) -> bool:
+        """Return whether signature is valid for payload under key."""
+        # as bytes, since compare_digest rejects non-ASCII str; utf-8 encodes any
+        # scanned text, and a non-ASCII signature then just fails to match
+        expected = self.sign(key, payload).encode("ascii")
+        return hmac.compare_digest(expected, signature.encode("utf-8"))
+
+
+class Status(IntEnum):
+    VALID = 0
+    INVALID = 1
+    UNSIGNED = 2
+    UNKNOWN_ISSUER = 3
+    MALFORMED = 4
+
+
+class Verification(NamedTuple):
+    status: Status
+    issuer: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return self.status == Status.VALID
+
+
+class VerifierStats(NamedTuple):
+    result_hits: int
+    result_misses: int
+    key_hits: int
+    key_misses: int
+    key_evictions: int
+
+
+class SignatureVerifier:
+    """Verify boarding pass signatures against the issuer's key.
+
+    keys maps airline_designator_of_boarding_pass_issuer to key material,
+    through its get method, so a dict works as a local key store. Keys are
+    loaded through the backend on first use and cached, least recently used
+    first out beyond max_keys and for at most key_ttl seconds, so rotated
+    keys are picked up. VALID and INVALID results are cached by barcode
+    string, max_results of them, so re-scans of a pass are not verified
+    again. Errors raised by the key store or backend give an uncached
+    INVALID rather than propagating. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        keys: Any,
+        backend: Any = None,
+        max_keys: int = 64,
+        key_ttl: Optional[float] = None,
+        max_results: int = 65536,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.keys = keys
+        self.backend = HMACBackend() if backend is None else backend
+        self.max_keys = max_keys
+        self.key_ttl = key_ttl
+        self.max_results = max_results
+        self._clock = clock
+        self._lock = Lock()
+        # issuer -> (key, expiry)
+        self._keys = OrderedDict()
+        # barcode string -> Verification
+        self._results = OrderedDict()
+        self._result_hits = self._result_misses = 0
+        self._key_hits = self._key_misses = self._key_evictions = 0
+
+    def _key(self, issuer: str):
+        """Return the loaded key of issuer, or None if the store has none."""
+        with self._lock:
+            entry = self._keys.get(issuer)
+            if entry is not None and (entry[1] is None or entry[1] > self._clock()):
+                self._keys.move_to_end(issuer)
+                self._key_hits += 1
+                return entry[0]
+            self._key_misses += 1
+
+        material = self.keys.get(issuer)
+        if material is None:
+            return None
+        key = self.backend.load_key(material)
+        expiry = None if self.key_ttl is None else self._clock() + self.key_ttl
+        with self._lock:
+            self._keys[issuer] = (key, expiry)
+            self._keys.move_to_end(issuer)
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self._key_evictions += 1
+        return key
+
+    def _cached(self, barcode: str) -> Optional[Verification]:
+        with self._lock:
+            result = self._results.get(barcode)
+            if result is None:
+                self._result_misses += 1
+            else:
+                self._results.move_to_end(barcode)
+                self._result_hits += 1
+            return result
+
+    def _verify(self, barcode: str) -> Verification:
+        try:
+            parts = signed_parts(barcode)
+        except Exception:
+            return Verification(Status.MALFORMED)
+        if parts.security_data is None:
+            return Verification(Status.UNSIGNED, parts.issuer)
+        try:
+            key = None if parts.issuer is None else self._key(parts.issuer)
+            if key is None:
+                return Verification(Status.UNKNOWN_ISSUER, parts.issuer)
+            valid = self.backend.verify(key, parts.payload, parts.security_data)
+        except Exception:
+            # a backend failure must not sink a whole batch; not cached, as it
+            # may be transient
+            return Verification(Status.INVALID, parts.issuer)
+
+        result = Verification(Status.VALID if valid else Status.INVALID, parts.issuer)
+        if self.max_results > 0:
+            with self._lock:
+                self._results[barcode] = result
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        return result
+
+    def verify(
+        self, barcode_string: Union[str, bytes, bytearray, memoryview]
+    ) -> Verification:
+        """Verify one barcode, reusing the result of an earlier scan of it."""
+        barcode = bytes_to_string(barcode_string) or ""
+        result = self._cached(barcode)
+        return self._verify(barcode) if result is None else result
+
+    def verify_many(
+        self,
+        barcodes: Iterable[Union[str, bytes, bytearray, memoryview]],
+        workers: int = 4,
+    ) -> List[Verification]:
+        """Verify barcodes on a thread pool, returning results in input order.
+
+        Cached results and repeats within the batch are resolved up front, so
+        only distinct unverified barcodes reach the pool. Threads pay off with
+        backends that release the GIL, as OpenSSL-based ones do.
+        """
+        barcodes = [bytes_to_string(barcode) or "" for barcode in barcodes]
+        results = {}
+        misses = []
+        for barcode in barcodes:
+            if barcode not in results:
+                results[barcode] = self._cached(barcode)
+                if results[barcode] is None:
+                    misses.append(barcode)
+
+        if workers <= 1 or len(misses) < 2:
+            results.update(zip(misses, map(self._verify, misses)))
+        else:
+            # imported here as most callers verify one pass at a time
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results.update(zip(misses, executor.map(self._verify, misses)))
+        return [results[barcode] for barcode in barcodes]
+
+    def stats(self) -> VerifierStats:
+        """Return result and key cache hit, miss and eviction counts."""
+        with self._lock:
+            return VerifierStats(
+                self._result_hits,
+                self._result_misses,
+                self._key_hits,
+                self._key_misses,
+                self._key_evictions,
+            )
+
+    def clear(self):
+        """Drop cached keys and results, e.g. after revoking a key."""
+        with self._lock:
+            self._keys.clear()
+            self._results.clear()
+
@@ -0,0 +1,170 @@
+import asyncio
+import struct
+from concurrent.futures import Executor
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Union
+
+from .batch import DecodeResult
+from .decode import decode
+from .utils import current_year
+
+NEWLINE = "newline"
+LENGTH = "length"
+
+# length-prefixed records start with their size as a big-endian uint16
+LENGTH_PREFIX = struct.Struct(">H")
+
+_END = object()
+
+
+async def read_frames(
+    reader: asyncio.StreamReader, framing: str = NEWLINE
+) -> AsyncIterator[Union[bytes, ValueError]]:
+    """Yield raw records from a stream, split by newline or length prefix.
+
+    Newline framing drops a trailing carriage return, skips blank lines and
+    yields a final record that lacks its newline. A line longer than the
+    reader's limit is skipped up to its newline and a ValueError is yielded
+    in its place. A stream cut off inside a length-prefixed record raises
+    asyncio.IncompleteReadError.
+    """
+    if framing == NEWLINE:
+        # set while discarding the rest of an over-long line
+        skipping = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.LimitOverrunError as error:
+                # the bytes read so far stay buffered until consumed
+                await reader.readexactly(error.consumed)
+                skipping = True
+                continue
+            except asyncio.IncompleteReadError as error:
+                line = error.partial
+                if not line and not skipping:
+                    return
+            if skipping:
+                yield ValueError("record is longer than the stream limit")
+                skipping = False
+                if not line.endswith(b"\n"):
+                    return
+                continue
+            record = line.rstrip(b"\r\n")
+            if record:
+                yield record
+    elif framing == LENGTH:
+        while True:
+            try:
+                header = await reader.readexactly(LENGTH_PREFIX.size)
+            except asyncio.IncompleteReadError as error:
+                if not error.partial:
+                    return
+                raise
+            (size,) = LENGTH_PREFIX.unpack(header)
+            yield await reader.readexactly(size)
+    else:
+        raise ValueError(f"unknown framing {framing!r}")
+
+
+def _decode_frames(
+    start: int, frames: List[Union[bytes, ValueError]], reference_year: int
+) -> List[DecodeResult]:
+    """Decode a batch of frames, capturing per-frame errors."""
+    results = []
+    for index, frame in enumerate(frames, start):
+        if isinstance(frame, ValueError):
+            results.append(DecodeResult(index, error=frame))
+            continue
+        try:
+            results.append(DecodeResult(index, decode(frame, reference_year)))
+        except Exception as error:
+            results.append(DecodeResult(index, error=error))
+    return results
+
+
+async def decode_stream(
+    reader: asyncio.StreamReader,
+    framing: str = NEWLINE,
+    reference_year: Optional[int] = None,
+    batch_size: int = 64,
+    queue_size: int = 1024,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[DecodeResult]:
+    """Decode the records of a stream, yielding one DecodeResult per record.
+
+    Records are read ahead into a queue of at most queue_size, so a slow
+    consumer stops reading from the socket instead of buffering without
+    bound. Whatever is queued (up to batch_size) is decoded as one batch; with
+    an executor, batches are decoded there so the event loop stays free.
+    Indexes count records from the start of the stream, and rows that fail to
+    decode carry their error instead of raising.
+    """
+    if reference_year is None:
+        reference_year = current_year()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=queue_size)
+    # the error that ended reading, raised once the queue is drained
+    failure = []
+
+    async def produce():
+        try:
+            async for frame in read_frames(reader, framing):
+                await queue.put(frame)
+        except Exception as error:
+            failure.append(error)
+        await queue.put(_END)
+
+    producer = asyncio.create_task(produce())
+    index = 0
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            done = batch[-1] is _END
+            frames = batch[:-1] if done else batch
+            if frames:
+                if executor is None:
+                    results = _decode_frames(index, frames, reference_year)
+                else:
+                    results = await loop.run_in_executor(
+                        executor, _decode_frames, index, frames, reference_year
+                    )
+                index += len(frames)
+                for result in results:
+                    yield result
+            if done:
+                if failure:
+                    raise failure[0]
+                return
+            if executor is None:
+                # let the reader and other connections run between batches
+                await asyncio.sleep(0)
+    finally:
+        producer.cancel()
+
+
+async def start_server(
+    on_result: Callable[[DecodeResult], Optional[Awaitable[None]]],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    **options,
+) -> asyncio.AbstractServer:
+    """Start a TCP server decoding every connection's records with decode_stream.
+
+    on_result is called with each DecodeResult and may be a coroutine
+    function; options are passed on to decode_stream. A process pool given as
+    the executor should use the spawn or forkserver start method, as workers
+    forked while connections are open keep them from closing.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            async for result in decode_stream(reader, **options):
+                outcome = on_result(result)
+                if outcome is not None:
+                    await outcome
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -1,4 +1,40 @@
-from datetime import datetime, timezone
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Optional, Union
+
+
+def bytes_to_string(
+    value: Union[str, bytes, bytearray, memoryview, None]
+) -> Optional[str]:
+    """Convert a bytes-like barcode to string, one character per byte."""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value, "latin-1")
+
+
+class BufferText:
+    """Read-only string view over a bytes-like barcode.
+
+    Slicing returns a str of just the sliced bytes, so a field only becomes a
+    string when it is read. Offsets are byte offsets, which match character
+    offsets for BCBP data.
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self.buffer = memoryview(buffer).cast("B")
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __getitem__(self, key: slice) -> str:
+        return str(self.buffer[key], "latin-1")
+
+    def __str__(self) -> str:
+        return str(self.buffer, "latin-1")
 
 
 def hex_to_number(hex_str: str) -> int:
@@ -13,21 +49,57 @@ def number_to_hex(n: int) -> str:
 
 def date_to_day_of_year(date: datetime, add_year_prefix: bool = False) -> str:
     """Convert date to day of year string format."""
-    # calculate day of year (1-based)
-    day_of_year = date.timetuple().tm_yday
+    # calculate day of year (1-based) from the ordinal of Jan 1
+    day_of_year = date.toordinal() - _first_day_ordinal(date.year) + 1
 
-    year_prefix = ""
     if add_year_prefix:
-        year_prefix = str(date.year)[-1]  # last digit of year
+        return f"{date.year % 10}{day_of_year:03d}"  # last digit of year
+    return f"{day_of_year:03d}"
+
 
-    return f"{year_prefix}{day_of_year:03d}"
+@lru_cache(maxsize=None)
+def _first_day_ordinal(year: int) -> int:
+    return datetime(year, 1, 1).toordinal()
+
+
+_reference_year: ContextVar[Optional[int]] = ContextVar("reference_year", default=None)
+
+
+def current_year() -> int:
+    """Return the reference year in effect: the fixed one, or the clock's."""
+    year = _reference_year.get()
+    return year if year is not None else datetime.now().year
+
+
+@contextmanager
+def fixed_reference_year(
+    year: Optional[int] = None, clock: Callable[[], datetime] = datetime.now
+):
+    """Fix the reference year used when none is passed, for a whole batch.
+
+    The year defaults to clock().year, read once on entry.
+    """
+    token = _reference_year.set(year if year is not None else clock().year)
+    try:
+        yield
+    finally:
+        _reference_year.reset(token)
 
 
 def day_of_year_to_date(
     day_of_year: str, has_year_prefix: bool, reference_year: int = None
 ) -> datetime:
     """Convert day of year string to datetime."""
-    current_year = reference_year if reference_year is not None else datetime.now().year
+    if reference_year is None:
+        reference_year = current_year()
+    return _day_of_year_to_date(day_of_year, has_year_prefix, reference_year)
+
+
+# bounded: only 366 days x 10 year prefixes per reference year are valid input
+@lru_cache(maxsize=16384)
+def _day_of_year_to_date(
+    day_of_year: str, has_year_prefix: bool, current_year: int
+) -> datetime:
     year = str(current_year)
     days_to_add = day_of_year
 
@@ -43,8 +115,6 @@ def day_of_year_to_date(
     # create date from year and day of year
     base_date = datetime(int(year), 1, 1, tzinfo=timezone.utc)
     # add (days_to_add - 1) days since Jan 1 is day 1, not day 0
-    from datetime import timedelta
-
     target_date = base_date + timedelta(days=int(days_to_add) - 1)
 
     return target_date
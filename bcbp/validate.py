@@ -0,0 +1,129 @@
+from enum import IntEnum
+from typing import NamedTuple, Union
+
+from . import layout
+
+_CONDITIONAL_HEADER_LENGTH = layout.section_length(layout.CONDITIONAL_HEADER)
+_SECURITY_HEADER_LENGTH = layout.section_length(layout.SECURITY_HEADER)
+_SIZE = layout.SECTION_SIZE_LENGTH
+_MANDATORY = layout.MANDATORY_LEG_LENGTH + _SIZE
+
+# keyed by both characters and byte values, so str and bytes index alike
+_HEX = {}
+for _value, _digit in enumerate("0123456789ABCDEF"):
+    for _key in (_digit, _digit.lower()):
+        _HEX[_key] = _HEX[ord(_key)] = _value
+_LEG_COUNTS = {str(n): n for n in range(1, 10)}
+_LEG_COUNTS.update({ord(key): n for key, n in _LEG_COUNTS.items()})
+_FORMAT_CODE = ("M", ord("M"))
+_VERSION_MARKER = (">", ord(">"))
+_SECURITY_MARKER = ("^", ord("^"))
+
+
+class ErrorCode(IntEnum):
+    OK = 0
+    TOO_SHORT = 1
+    BAD_FORMAT_CODE = 2
+    BAD_LEG_COUNT = 3
+    BAD_SECTION_SIZE = 4
+    SECTION_OVERRUN = 5
+    BAD_VERSION_MARKER = 6
+    BAD_SECURITY_MARKER = 7
+    # field contents, only reported by decode_checked
+    BAD_NUMBER = 8
+    BAD_DATE = 9
+    BAD_FLAG = 10
+
+
+class Validation(NamedTuple):
+    code: ErrorCode
+    offset: int
+
+    def __bool__(self) -> bool:
+        return self.code == ErrorCode.OK
+
+
+_VALID = Validation(ErrorCode.OK, -1)
+
+
+def _size(s, position: int) -> int:
+    """Return the section size at position, or -1 if it is not two hex digits."""
+    high = _HEX.get(s[position])
+    low = _HEX.get(s[position + 1])
+    if high is None or low is None:
+        return -1
+    return high * 16 + low
+
+
+def validate(barcode_string: Union[str, bytes, bytearray, memoryview]) -> Validation:
+    """Check the structure of a BCBP barcode string without decoding it.
+
+    Only the format code, leg count, section sizes and the version and
+    security markers are read, one character at a time; field contents such
+    as dates are not checked. Returns a Validation holding the first error
+    found and its offset, which is truthy when the barcode is well formed.
+    """
+    s = barcode_string
+    if isinstance(s, memoryview) and s.format != "B":
+        s = s.cast("B")
+    length = len(s)
+    if length < layout.HEADER_LENGTH:
+        return Validation(ErrorCode.TOO_SHORT, length)
+    if s[0] not in _FORMAT_CODE:
+        return Validation(ErrorCode.BAD_FORMAT_CODE, 0)
+    number_of_legs = _LEG_COUNTS.get(s[1])
+    if number_of_legs is None:
+        return Validation(ErrorCode.BAD_LEG_COUNT, 1)
+
+    position = layout.HEADER_LENGTH
+    for leg_index in range(number_of_legs):
+        if position + _MANDATORY > length:
+            return Validation(ErrorCode.TOO_SHORT, length)
+        position += layout.MANDATORY_LEG_LENGTH
+        size = _size(s, position)
+        if size < 0:
+            return Validation(ErrorCode.BAD_SECTION_SIZE, position)
+        start = position + _SIZE
+        end = start + size
+        if end > length:
+            return Validation(ErrorCode.SECTION_OVERRUN, position)
+        position = end
+        if size == 0:
+            continue
+
+        offset = start
+        if leg_index == 0:
+            if s[offset] not in _VERSION_MARKER:
+                return Validation(ErrorCode.BAD_VERSION_MARKER, offset)
+            offset += _CONDITIONAL_HEADER_LENGTH
+        # section A (first leg only), then section B, each sized and optional
+        for _ in range(2 if leg_index == 0 else 1):
+            if offset == end:
+                break
+            if offset + _SIZE > end:
+                return Validation(ErrorCode.SECTION_OVERRUN, offset)
+            size = _size(s, offset)
+            if size < 0:
+                return Validation(ErrorCode.BAD_SECTION_SIZE, offset)
+            if offset + _SIZE + size > end:
+                return Validation(ErrorCode.SECTION_OVERRUN, offset)
+            offset += _SIZE + size
+
+    if position == length:
+        return _VALID
+    if s[position] not in _SECURITY_MARKER:
+        return Validation(ErrorCode.BAD_SECURITY_MARKER, position)
+    position += _SECURITY_HEADER_LENGTH
+    if position + _SIZE > length:
+        return Validation(ErrorCode.TOO_SHORT, length)
+    size = _size(s, position)
+    if size < 0:
+        return Validation(ErrorCode.BAD_SECTION_SIZE, position)
+    if position + _SIZE + size > length:
+        return Validation(ErrorCode.SECTION_OVERRUN, position)
+    return _VALID
+
+
+def is_valid(barcode_string: Union[str, bytes, bytearray, memoryview]) -> bool:
+    """Return whether a BCBP barcode string is structurally well formed."""
+    return validate(barcode_string).code == ErrorCode.OK
@@ -0,0 +1,68 @@
+"""Leg.airline_use with registered carrier layouts against per-scan regexes.
+
+Run with ``python -m benchmarks.airline`` from the repository root.
+"""
+import re
+import timeit
+
+from bcbp import decode
+from bcbp.airline import Delimited, FixedWidth, register, unregister
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+# four of the corpus's ten carriers; the others stay unregistered
+_LAYOUTS = {
+    "LH": FixedWidth((("fare_class", 1), ("tier", 3), ("meal", 4), ("note", 32))),
+    "BA": FixedWidth((("tier", 2), ("lounge", 1), ("note", 37))),
+    "AF": Delimited(("tier", "lounge", "note"), "/"),
+    "QF": Delimited(("tier", "note"), "-"),
+}
+_PATTERNS = {
+    "LH": re.compile(r"(?P<fare_class>.)(?P<tier>.{0,3})(?P<meal>.{0,4})(?P<note>.*)"),
+    "BA": re.compile(r"(?P<tier>.{0,2})(?P<lounge>.?)(?P<note>.*)"),
+    "AF": re.compile(r"(?P<tier>[^/]*)/?(?P<lounge>[^/]*)/?(?P<note>.*)"),
+    "QF": re.compile(r"(?P<tier>[^-]*)-?(?P<note>.*)"),
+}
+
+
+def _regex(passes):
+    results = []
+    for bcbp in passes:
+        for leg in bcbp.data.legs:
+            pattern = _PATTERNS.get(leg.operating_carrier_designator)
+            text = leg.for_individual_airline_use
+            if pattern is not None and text is not None:
+                match = pattern.match(text)
+                results.append(
+                    {k: v.strip() or None for k, v in match.groupdict().items()}
+                )
+    return results
+
+
+def _airline_use(passes):
+    return [leg.airline_use for bcbp in passes for leg in bcbp.data.legs]
+
+
+def main(count: int = 20000):
+    barcodes = [barcode for _, barcode in generate(SCENARIOS["4-leg full"], count)]
+    passes = [decode(barcode, REFERENCE_YEAR) for barcode in barcodes]
+    legs = sum(len(bcbp.data.legs) for bcbp in passes)
+
+    def report(name, run, items):
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{name:<34} {items / seconds:10.0f} legs/s")
+
+    report("decode", lambda: [decode(b, REFERENCE_YEAR) for b in barcodes], legs)
+    report("airline_use, none registered", lambda: _airline_use(passes), legs)
+    for carrier, layout in _LAYOUTS.items():
+        register(carrier, layout)
+    try:
+        report("regex per scan, 4 carriers", lambda: _regex(passes), legs)
+        report("airline_use, 4 carriers", lambda: _airline_use(passes), legs)
+    finally:
+        for carrier in _LAYOUTS:
+            unregister(carrier)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Size and speed of binary records against pickle and JSON.
+
+Run with ``python -m benchmarks.binary`` from the repository root.
+"""
+import json
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import asdict
+
+from bcbp import RecordFile, decode, write_records
+from bcbp.binary import dumps, loads
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+
+def _timed(label: str, func, items: list):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {len(items) / elapsed:9.0f} ops/s")
+    return results
+
+
+def _check_little_endian(path: str, passes: list):
+    """Read back a record file laid out by hand, little-endian throughout."""
+    records = [dumps(bcbp) for bcbp in passes]
+    offsets = [8]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    with open(path, "wb") as file:
+        file.write(b"BCBPREC1" + b"".join(records))
+        for offset in offsets:
+            file.write(offset.to_bytes(8, "little"))
+        file.write(len(records).to_bytes(8, "little") + b"BCBPREC1")
+    with RecordFile(path) as records_file:
+        assert list(records_file) == [loads(record) for record in records]
+        assert records_file.field(len(records) - 1, "passenger_name") == (
+            passes[-1].data.passenger_name
+        )
+
+
+def main(count: int = 20000):
+    passes = [
+        decode(barcode, REFERENCE_YEAR)
+        for _, barcode in generate(SCENARIOS["mixed"], count)
+    ]
+
+    records = _timed("binary dumps", dumps, passes)
+    _timed("binary loads", loads, records)
+    pickles = _timed("pickle dumps", pickle.dumps, passes)
+    _timed("pickle loads", pickle.loads, pickles)
+    documents = _timed(
+        "json dumps", lambda bcbp: json.dumps(asdict(bcbp), default=str), passes
+    )
+    for label, encoded in (
+        ("binary", records),
+        ("pickle", pickles),
+        ("json", documents),
+    ):
+        size = sum(len(item) for item in encoded) / count
+        print(f"{label:<8} {size:6.0f} B/pass")
+
+    with tempfile.TemporaryDirectory() as directory:
+        _check_little_endian(os.path.join(directory, "portable.bcbprec"), passes[:100])
+        path = os.path.join(directory, "passes.bcbprec")
+        write_records(path, passes)
+        with RecordFile(path) as records_file:
+            indexes = list(range(0, count, 7))
+            _timed(
+                "mmap field read",
+                lambda i: records_file.field(i, "flight_number", 0),
+                indexes,
+            )
+            _timed("mmap record read", records_file.__getitem__, indexes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Compare DecodeCache hits against decoding every scan.
+
+Run with ``python -m benchmarks.cache`` from the repository root.
+"""
+import timeit
+
+from bcbp import DecodeCache, decode
+
+from .samples import barcodes
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number: int = 20000):
+    cache = DecodeCache()
+    for name, barcode in barcodes().items():
+        assert cache.decode(barcode, 2024) == decode(barcode, 2024)
+        decoded = _best(lambda: decode(barcode, 2024), number)
+        cached = _best(lambda: cache.decode(barcode, 2024), number)
+        print(
+            f"{name:<16} decode {decoded / number * 1e6:7.2f} us"
+            f"  cache hit {cached / number * 1e6:7.2f} us"
+            f"  speedup {decoded / cached:4.1f}x"
+        )
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare decode_columns against a list of decoded passes.
+
+Run with ``python -m benchmarks.columns`` from the repository root (requires
+numpy).
+"""
+import time
+import tracemalloc
+
+from bcbp import decode, decode_columns
+
+from .samples import barcodes
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(rows: int = 100000):
+    samples = list(barcodes().values())
+    batch = [samples[i % len(samples)] for i in range(rows)]
+
+    _, objects_time, objects_peak = _measure(lambda: [decode(b, 2024) for b in batch])
+    columns, columns_time, columns_peak = _measure(
+        lambda: decode_columns(batch, 2024)
+    )
+    print(f"rows             {rows}")
+    print(
+        f"objects          {objects_time:7.2f} s  peak {objects_peak / 2**20:8.1f} MiB"
+    )
+    print(
+        f"columns          {columns_time:7.2f} s  peak {columns_peak / 2**20:8.1f} MiB"
+        f"  result {columns.nbytes / 2**20:.1f} MiB"
+    )
+    print(f"speedup          {objects_time / columns_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Seeded generator of realistic boarding passes and their barcode strings.
+
+The same seed always gives the same corpus, so timings taken from it can be
+compared across runs and machines.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from bcbp import (
+    BarcodedBoardingPass,
+    BoardingPassData,
+    BoardingPassMetaData,
+    Leg,
+    encode,
+)
+
+REFERENCE_YEAR = 2024
+
+_SURNAMES = ["SMITH", "DESMARAIS", "NGUYEN", "OKAFOR", "MUELLER", "GARCIA", "TANAKA"]
+_GIVEN = ["LUC", "ANNA", "JOHN MR", "MARIA MRS", "WEI", "FATIMA", "OLIVIA MS"]
+_AIRPORTS = ["YUL", "FRA", "NRT", "SYD", "JFK", "LHR", "CDG", "SIN", "DXB", "GRU"]
+_CARRIERS = ["AC", "LH", "NH", "QF", "BA", "AF", "SQ", "EK", "LA", "U2"]
+_COMPARTMENTS = "FJCWYM"
+_ALPHANUMERIC = "ABCDEFGHJKLMNPQRSTUVWXYZ0123456789"
+
+
+class Scenario(NamedTuple):
+    legs: Tuple[int, int]
+    version: int = 6
+    # probability of each optional section A/B field being present
+    optional: float = 1.0
+    security: float = 1.0
+    airline_use: float = 1.0
+
+
+SCENARIOS = {
+    "mandatory-only": Scenario(legs=(1, 1), version=5, security=0.0),
+    "1-leg minimal": Scenario(legs=(1, 1), optional=0.0, security=0.0, airline_use=0.0),
+    "1-leg full": Scenario(legs=(1, 1)),
+    "4-leg full": Scenario(legs=(4, 4)),
+    "mixed": Scenario(legs=(1, 4), optional=0.5, security=0.5, airline_use=0.3),
+}
+
+
+def _text(rng: random.Random, length: int, alphabet: str = _ALPHANUMERIC) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def _digits(rng: random.Random, length: int) -> str:
+    return _text(rng, length, "0123456789")
+
+
+def _maybe(rng: random.Random, probability: float, value):
+    return value if rng.random() < probability else None
+
+
+def _leg(
+    rng: random.Random, scenario: Scenario, date_of_flight: datetime, origin: str
+) -> Leg:
+    optional = scenario.optional
+    carrier = rng.choice(_CARRIERS)
+    return Leg(
+        operating_carrier_pnr_code=_text(rng, 6),
+        from_city_airport_code=origin,
+        to_city_airport_code=rng.choice([a for a in _AIRPORTS if a != origin]),
+        operating_carrier_designator=carrier,
+        flight_number=str(rng.randint(1, 9999)),
+        date_of_flight=date_of_flight,
+        compartment_code=rng.choice(_COMPARTMENTS),
+        seat_number=f"{rng.randint(1, 60)}{rng.choice('ABCDEFGHJK')}",
+        check_in_sequence_number=str(rng.randint(1, 350)),
+        passenger_status=rng.choice("0123"),
+        airline_numeric_code=_maybe(rng, optional, _digits(rng, 3)),
+        document_form_serial_number=_maybe(rng, optional, _digits(rng, 10)),
+        selectee_indicator=_maybe(rng, optional, rng.choice("013")),
+        international_documentation_verification=_maybe(rng, optional, "0"),
+        marketing_carrier_designator=_maybe(rng, optional, carrier),
+        frequent_flyer_airline_designator=_maybe(rng, optional, carrier),
+        frequent_flyer_number=_maybe(rng, optional, _digits(rng, rng.randint(8, 16))),
+        id_ad_indicator=_maybe(rng, optional, "0"),
+        free_baggage_allowance=_maybe(rng, optional, rng.choice(["20K", "2PC", "1PC"])),
+        fast_track=_maybe(rng, optional, rng.random() < 0.2),
+        for_individual_airline_use=_maybe(
+            rng, scenario.airline_use, _text(rng, rng.randint(4, 40))
+        ),
+    )
+
+
+def generate_pass(rng: random.Random, scenario: Scenario) -> BarcodedBoardingPass:
+    """Build one random pass for scenario."""
+    optional = scenario.optional
+    first_day = datetime(REFERENCE_YEAR, 1, 1, tzinfo=timezone.utc)
+    date_of_issue = first_day + timedelta(days=rng.randint(0, 360))
+    legs = []
+    origin = rng.choice(_AIRPORTS)
+    date_of_flight = date_of_issue
+    for _ in range(rng.randint(*scenario.legs)):
+        date_of_flight += timedelta(days=rng.randint(0, 2))
+        leg = _leg(rng, scenario, date_of_flight, origin)
+        legs.append(leg)
+        origin = leg.to_city_airport_code
+
+    has_security = rng.random() < scenario.security
+    data = BoardingPassData(
+        legs=legs,
+        passenger_name=f"{rng.choice(_SURNAMES)}/{rng.choice(_GIVEN)}",
+        passenger_description=_maybe(rng, optional, rng.choice("0128")),
+        source_of_check_in=_maybe(rng, optional, rng.choice("WKRMO")),
+        source_of_boarding_pass_issuance=_maybe(rng, optional, rng.choice("WKXT")),
+        date_of_issue_of_boarding_pass=_maybe(rng, optional, date_of_issue),
+        document_type=_maybe(rng, optional, "B"),
+        airline_designator_of_boarding_pass_issuer=_maybe(
+            rng, optional, legs[0].operating_carrier_designator
+        ),
+        baggage_tag_licence_plate_number=_maybe(rng, optional / 2, _digits(rng, 13)),
+        type_of_security_data="1" if has_security else None,
+        security_data=_text(rng, rng.randint(40, 100)) if has_security else None,
+    )
+    return BarcodedBoardingPass(
+        data=data, meta=BoardingPassMetaData(version_number=scenario.version)
+    )
+
+
+def generate(
+    scenario: Scenario, count: int, seed: int = 0
+) -> List[Tuple[BarcodedBoardingPass, str]]:
+    """Return count (pass, barcode string) pairs for scenario."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        bcbp = generate_pass(rng, scenario)
+        pairs.append((bcbp, encode(bcbp)))
+    return pairs
+
+
+def corpus(count: int = 1000, seed: int = 0, names: Optional[List[str]] = None) -> dict:
+    """Return a generated corpus for each named scenario (all by default)."""
+    return {
+        name: generate(scenario, count, seed)
+        for name, scenario in SCENARIOS.items()
+        if names is None or name in names
+    }
@@ -0,0 +1,29 @@
+"""Compare the compiled decode engine against the SectionDecoder walk.
+
+Run with ``python -m benchmarks.decode`` from the repository root.
+"""
+import timeit
+
+from bcbp.decode import decode, decode_reference
+
+from .samples import barcodes
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number: int = 20000):
+    for name, barcode in barcodes().items():
+        assert decode(barcode, 2024) == decode_reference(barcode, 2024)
+        reference = _best(lambda: decode_reference(barcode, 2024), number)
+        compiled = _best(lambda: decode(barcode, 2024), number)
+        print(
+            f"{name:<16} reference {reference / number * 1e6:7.2f} us"
+            f"  compiled {compiled / number * 1e6:7.2f} us"
+            f"  speedup {reference / compiled:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""decode_checked against decode wrapped in try/except, at several junk rates.
+
+Run with ``python -m benchmarks.diagnostics`` from the repository root.
+"""
+import random
+import timeit
+
+from bcbp import DiagnosticReport, decode, decode_checked
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+
+def _junk(rng: random.Random, barcode: str) -> str:
+    """Corrupt a barcode with an unreadable date or section size."""
+    position = rng.choice((44, 58))  # date of flight, conditional section size
+    return barcode[:position] + "x" + barcode[position + 1 :]
+
+
+def _decode_all(barcodes):
+    results = []
+    for barcode in barcodes:
+        try:
+            results.append(decode(barcode, REFERENCE_YEAR))
+        except Exception as error:
+            results.append(error)
+    return results
+
+
+def _decode_checked_all(barcodes):
+    report = DiagnosticReport()
+    results = []
+    for barcode in barcodes:
+        bcbp, diagnostic = decode_checked(barcode, REFERENCE_YEAR)
+        report.add(diagnostic)
+        results.append(bcbp)
+    return results, report
+
+
+def main(count: int = 20000):
+    rng = random.Random(0)
+    barcodes = [barcode for _, barcode in generate(SCENARIOS["mixed"], count)]
+    for rate in (0.0, 0.05, 0.10):
+        batch = [
+            _junk(rng, barcode) if rng.random() < rate else barcode
+            for barcode in barcodes
+        ]
+        for name, run in (
+            ("decode + try/except", _decode_all),
+            ("decode_checked", _decode_checked_all),
+        ):
+            seconds = min(timeit.repeat(lambda: run(batch), number=1, repeat=3))
+            print(f"junk {rate:4.0%}  {name:<20} {count / seconds:9.0f} passes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Compare encode against the SectionBuilder reference encoder.
+
+Run with ``python -m benchmarks.encode`` from the repository root.
+"""
+import timeit
+
+from bcbp.encode import encode, encode_reference
+
+from .samples import passes
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number: int = 20000):
+    for name, bcbp in passes().items():
+        assert encode(bcbp) == encode_reference(bcbp)
+        reference = _best(lambda: encode_reference(bcbp), number)
+        direct = _best(lambda: encode(bcbp), number)
+        print(
+            f"{name:<16} reference {reference / number * 1e6:7.2f} us"
+            f"  encode {direct / number * 1e6:7.2f} us"
+            f"  speedup {reference / direct:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""encode_columns against building passes and calling encode per pass.
+
+Run with ``python -m benchmarks.encode_columns`` from the repository root.
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from bcbp import encode, encode_columns
+from bcbp.models import BarcodedBoardingPass, BoardingPassData, Leg
+
+from .corpus import REFERENCE_YEAR
+
+
+def _columns(count: int, seed: int = 0) -> dict:
+    """Columns for a load test: one leg, a few flights, many passengers."""
+    rng = random.Random(seed)
+    start = datetime(REFERENCE_YEAR, 3, 1, tzinfo=timezone.utc)
+    flights = [
+        (rng.choice(("LH", "AF", "BA", "NH")), str(rng.randint(1, 9999)))
+        for _ in range(50)
+    ]
+    chosen = [rng.choice(flights) for _ in range(count)]
+    return {
+        "passenger_name": [f"PAX{n:06d}/TEST" for n in range(count)],
+        "operating_carrier_pnr_code": [f"{n:06X}" for n in range(count)],
+        "from_city_airport_code": [rng.choice(("FRA", "CDG", "LHR")) for _ in chosen],
+        "to_city_airport_code": [rng.choice(("JFK", "NRT", "SIN")) for _ in chosen],
+        "operating_carrier_designator": [carrier for carrier, _ in chosen],
+        "flight_number": [number for _, number in chosen],
+        "date_of_flight": [start + timedelta(days=rng.randint(0, 30)) for _ in chosen],
+        "compartment_code": ["Y"] * count,
+        "seat_number": [f"{rng.randint(1, 60)}{rng.choice('ABCDEF')}" for _ in chosen],
+        "check_in_sequence_number": [str(n % 400 + 1) for n in range(count)],
+        "passenger_status": ["1"] * count,
+        "date_of_issue_of_boarding_pass": [start] * count,
+        "frequent_flyer_number": [None] * count,
+        "fast_track": [rng.random() < 0.1 for _ in chosen],
+    }
+
+
+def _encode_each(columns: dict) -> list:
+    names = list(columns)
+    leg_names = [name for name in names if hasattr(Leg, name)]
+    data_names = [name for name in names if name not in leg_names]
+    barcodes = []
+    for row in zip(*columns.values()):
+        values = dict(zip(names, row))
+        leg = Leg(**{name: values[name] for name in leg_names})
+        data = BoardingPassData(
+            legs=[leg], **{name: values[name] for name in data_names}
+        )
+        barcodes.append(encode(BarcodedBoardingPass(data=data)))
+    return barcodes
+
+
+def main(count: int = 100000):
+    columns = _columns(count)
+    assert encode_columns(columns) == _encode_each(columns)
+    for name, run in (
+        ("encode per pass", lambda: _encode_each(columns)),
+        ("encode_columns", lambda: encode_columns(columns)),
+    ):
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{name:<16} {count / seconds:9.0f} passes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Insert rate, lookup cost and memory per leg of PassIndex.
+
+Run with ``python -m benchmarks.index`` from the repository root.
+"""
+import time
+import timeit
+import tracemalloc
+from dataclasses import replace
+
+from bcbp import PassIndex, decode
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+
+def _check_incomplete_keys(bcbp):
+    """Two legs without a PNR must not count as a duplicate boarding."""
+    legs = [replace(bcbp.data.legs[0], operating_carrier_pnr_code=None)] * 2
+    index = PassIndex([replace(bcbp, data=replace(bcbp.data, legs=legs))])
+    assert not list(index.duplicates())
+
+
+def main(count: int = 50000):
+    passes = [
+        decode(barcode, REFERENCE_YEAR, compact=True)
+        for _, barcode in generate(SCENARIOS["mixed"], count)
+    ]
+
+    _check_incomplete_keys(decode(generate(SCENARIOS["mixed"], 1)[0][1]))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = PassIndex(passes)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{index.leg_count} legs  insert {index.leg_count / elapsed:8.0f} legs/s"
+        f"  index memory {size / index.leg_count:5.0f} B/leg"
+    )
+
+    leg = passes[count // 2].data.legs[0]
+    lookups = {
+        "pnr": lambda: index.by_pnr(leg.operating_carrier_pnr_code),
+        "flight": lambda: index.by_flight(
+            leg.operating_carrier_designator, leg.flight_number, leg.date_of_flight
+        ),
+        "duplicate check": lambda: index.seen(
+            leg.operating_carrier_pnr_code,
+            leg.operating_carrier_designator,
+            leg.flight_number,
+            leg.date_of_flight,
+        ),
+    }
+    for name, lookup in lookups.items():
+        seconds = min(timeit.repeat(lookup, number=20000, repeat=3)) / 20000
+        print(f"{name:<16} {seconds * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Cost of decode and encode with instrumentation off and on.
+
+Run with ``python -m benchmarks.instrument`` from the repository root.
+"""
+import timeit
+
+from bcbp import decode, encode, instrument
+from bcbp.encode import _encode
+from bcbp.engine import decode_compiled
+
+from .samples import barcodes, passes
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 20000):
+    samples = passes()
+    for name, barcode in barcodes().items():
+        bcbp = samples[name]
+        bare = _best(lambda: decode_compiled(barcode, 2024), number)
+        off = _best(lambda: decode(barcode, 2024), number)
+        with instrument.instrumented():
+            on = _best(lambda: decode(barcode, 2024), number)
+        print(
+            f"{name:<16} decode  bare {bare:6.2f} us  off {off:6.2f} us"
+            f"  on {on:6.2f} us"
+        )
+        bare = _best(lambda: _encode(bcbp), number)
+        off = _best(lambda: encode(bcbp), number)
+        with instrument.instrumented():
+            on = _best(lambda: encode(bcbp), number)
+        print(
+            f"{name:<16} encode  bare {bare:6.2f} us  off {off:6.2f} us"
+            f"  on {on:6.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare full decode against lazy views when reading a few fields per leg.
+
+Run with ``python -m benchmarks.lazy`` from the repository root.
+"""
+import timeit
+
+from bcbp import decode, decode_lazy
+
+from .samples import barcodes
+
+
+def _read_gate_fields(bcbp):
+    return [
+        (
+            leg.operating_carrier_pnr_code,
+            leg.flight_number,
+            leg.date_of_flight,
+            leg.seat_number,
+            leg.frequent_flyer_number,
+        )
+        for leg in bcbp.data.legs
+    ]
+
+
+def main(number: int = 20000):
+    for name, barcode in barcodes().items():
+        assert _read_gate_fields(decode(barcode, 2024)) == _read_gate_fields(
+            decode_lazy(barcode, 2024)
+        )
+        full = min(
+            timeit.repeat(
+                lambda: _read_gate_fields(decode(barcode, 2024)),
+                number=number,
+                repeat=3,
+            )
+        )
+        lazy = min(
+            timeit.repeat(
+                lambda: _read_gate_fields(decode_lazy(barcode, 2024)),
+                number=number,
+                repeat=3,
+            )
+        )
+        print(
+            f"{name:<16} decode {full / number * 1e6:7.2f} us"
+            f"  lazy {lazy / number * 1e6:7.2f} us"
+            f"  speedup {full / lazy:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
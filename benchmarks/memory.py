@@ -0,0 +1,35 @@
+"""Report retained bytes per decoded pass for regular and compact models.
+
+Run with ``python -m benchmarks.memory`` from the repository root.
+"""
+import tracemalloc
+
+from bcbp import decode
+
+from .samples import barcodes
+
+
+def _bytes_per_pass(barcode: str, compact: bool, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    passes = [decode(barcode, 2024, compact=compact) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del passes
+    return (after - before) / count
+
+
+def main(count: int = 20000):
+    samples = barcodes()
+    for name in ("1-leg full", "4-leg full"):
+        regular = _bytes_per_pass(samples[name], False, count)
+        compact = _bytes_per_pass(samples[name], True, count)
+        print(
+            f"{name:<16} dataclass {regular:7.0f} B/pass"
+            f"  compact {compact:7.0f} B/pass"
+            f"  saving {1 - compact / regular:4.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
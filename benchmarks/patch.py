@@ -0,0 +1,38 @@
+"""Compare patch against a decode, change and encode round trip.
+
+Run with ``python -m benchmarks.patch`` from the repository root.
+"""
+import timeit
+
+from bcbp import decode, encode, patch
+
+from .samples import barcodes
+
+CHANGES = {"seat_number": "012C", "frequent_flyer_number": "1234567890"}
+
+
+def _round_trip(barcode: str) -> str:
+    bcbp = decode(barcode, 2024)
+    for name, value in CHANGES.items():
+        setattr(bcbp.data.legs[0], name, value)
+    return encode(bcbp)
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3))
+
+
+def main(number: int = 20000):
+    for name, barcode in barcodes().items():
+        assert patch(barcode, **CHANGES) == _round_trip(barcode)
+        round_trip = _best(lambda: _round_trip(barcode), number)
+        patched = _best(lambda: patch(barcode, **CHANGES), number)
+        print(
+            f"{name:<16} round trip {round_trip / number * 1e6:7.2f} us"
+            f"  patch {patched / number * 1e6:7.2f} us"
+            f"  speedup {round_trip / patched:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
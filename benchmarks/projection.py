@@ -0,0 +1,42 @@
+"""Compare full decode against a gate-validator field projection.
+
+Run with ``python -m benchmarks.projection`` from the repository root.
+"""
+import timeit
+
+from bcbp import Projection, decode
+
+from .samples import barcodes
+
+GATE_FIELDS = Projection(
+    [
+        "legs.operating_carrier_pnr_code",
+        "legs.operating_carrier_designator",
+        "legs.flight_number",
+        "legs.seat_number",
+        "legs.check_in_sequence_number",
+    ]
+)
+
+
+def main(number: int = 20000):
+    for name, barcode in barcodes().items():
+        full = min(
+            timeit.repeat(lambda: decode(barcode, 2024), number=number, repeat=3)
+        )
+        projected = min(
+            timeit.repeat(
+                lambda: decode(barcode, 2024, fields=GATE_FIELDS),
+                number=number,
+                repeat=3,
+            )
+        )
+        print(
+            f"{name:<16} decode {full / number * 1e6:7.2f} us"
+            f"  projected {projected / number * 1e6:7.2f} us"
+            f"  speedup {full / projected:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
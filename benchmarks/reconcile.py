@@ -0,0 +1,110 @@
+"""reconcile against a single-process decode loop, by worker count.
+
+Run with ``python -m benchmarks.reconcile`` from the repository root. Scaling
+is bounded by the CPUs available; the count is printed with the results.
+"""
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from bcbp import decode
+from bcbp.index import _complete, _day, _flight_number, _strip
+from bcbp.reconcile import reconcile
+from bcbp.scanlog import iter_records
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+
+def _junk_pnr(barcode: str) -> str:
+    # the PNR is the first field of the first leg, right after the header
+    return barcode[:23] + "A\tB\\C\tD" + barcode[30:]
+
+
+def _blank_pnr(barcode: str) -> str:
+    return barcode[:23] + " " * 7 + barcode[30:]
+
+
+def _write_logs(directory: str, count: int):
+    rng = random.Random(0)
+    barcodes = [barcode for _, barcode in generate(SCENARIOS["mixed"], count)]
+    gate = [barcode for barcode in barcodes if rng.random() < 0.95]
+    gate += rng.sample(gate, len(gate) // 100)  # duplicate boardings
+    # junk scans whose PNR holds the spill file separators
+    gate += [_junk_pnr(barcode) for barcode in rng.sample(barcodes, 10)]
+    # scans without a PNR, which must not match or duplicate each other
+    gate += [_blank_pnr(barcode) for barcode in rng.sample(barcodes, 10)]
+    rng.shuffle(gate)
+    security = [barcode for barcode in barcodes if rng.random() < 0.95]
+    security += [_junk_pnr(barcode) for barcode in rng.sample(barcodes, 10)]
+    security += [_blank_pnr(barcode) for barcode in rng.sample(barcodes, 10)]
+    paths = []
+    for name, lines in (("gate.log", gate), ("security.log", security)):
+        path = os.path.join(directory, name)
+        with open(path, "w") as file:
+            file.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def _loop(gate_log: str, security_log: str) -> tuple:
+    """The plain approach: decode every record and count keys in dicts."""
+    counts = []
+    incomplete = 0
+    for path in (gate_log, security_log):
+        keys = Counter()
+        for record in iter_records(path):
+            for leg in decode(record, REFERENCE_YEAR).data.legs:
+                key = (
+                    _strip(leg.operating_carrier_pnr_code),
+                    _strip(leg.operating_carrier_designator),
+                    _flight_number(leg.flight_number),
+                    _day(leg.date_of_flight),
+                )
+                if _complete(key):
+                    keys[key] += 1
+                else:
+                    incomplete += 1
+        counts.append(keys)
+    gate, security = counts
+    return (
+        sorted(key for key in gate if key not in security),
+        sorted(key for key in security if key not in gate),
+        sorted((key, count) for key, count in gate.items() if count > 1),
+        incomplete,
+    )
+
+
+def main(count: int = 100000):
+    with tempfile.TemporaryDirectory() as directory:
+        gate_log, security_log = _write_logs(directory, count)
+        size = os.path.getsize(gate_log) + os.path.getsize(security_log)
+
+        start = time.perf_counter()
+        expected = _loop(gate_log, security_log)
+        seconds = time.perf_counter() - start
+        print(f"{'decode loop':<20} {size / 1e6 / seconds:8.1f} MB/s")
+
+        workers = 1
+        while workers <= max(os.cpu_count() or 1, 2):
+            result = reconcile(
+                [gate_log], [security_log], workers, REFERENCE_YEAR, shard_bytes=8 << 20
+            )
+            assert result[:3] == expected[:3]
+            assert result.incomplete == expected[3] >= 20
+            print(
+                f"{f'reconcile, {workers} workers':<20}"
+                f" {result.megabytes_per_second:8.1f} MB/s"
+                f" {result.records_per_second:10.0f} records/s"
+            )
+            workers *= 2
+        print(
+            f"({os.cpu_count()} CPUs, {size / 1e6:.0f} MB,"
+            f" {len(result.gate_only)} gate only, {len(result.security_only)}"
+            f" security only, {len(result.duplicate_boardings)} duplicates)"
+        )
+
+
+if __name__ == "__main__":
+    main()
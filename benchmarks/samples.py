@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from bcbp import BarcodedBoardingPass, BoardingPassData, Leg, encode
+
+
+def _leg(**overrides) -> Leg:
+    fields = dict(
+        operating_carrier_pnr_code="ABC123",
+        from_city_airport_code="YUL",
+        to_city_airport_code="FRA",
+        operating_carrier_designator="AC",
+        flight_number="834",
+        date_of_flight=datetime(2024, 11, 21, tzinfo=timezone.utc),
+        compartment_code="J",
+        seat_number="1A",
+        check_in_sequence_number="25",
+        passenger_status="1",
+    )
+    fields.update(overrides)
+    return Leg(**fields)
+
+
+def _full_leg(**overrides) -> Leg:
+    fields = dict(
+        airline_numeric_code="014",
+        document_form_serial_number="1234567890",
+        international_documentation_verification="1",
+        marketing_carrier_designator="AC",
+        frequent_flyer_airline_designator="AC",
+        frequent_flyer_number="1234567890123",
+        free_baggage_allowance="2PC",
+        fast_track=True,
+        for_individual_airline_use="LX58Z",
+    )
+    fields.update(overrides)
+    return _leg(**fields)
+
+
+def _full_data(legs) -> BoardingPassData:
+    return BoardingPassData(
+        legs=legs,
+        passenger_name="DESMARAIS/LUC",
+        passenger_description="1",
+        source_of_check_in="W",
+        source_of_boarding_pass_issuance="W",
+        date_of_issue_of_boarding_pass=datetime(2024, 11, 20, tzinfo=timezone.utc),
+        document_type="B",
+        airline_designator_of_boarding_pass_issuer="AC",
+        baggage_tag_licence_plate_number="0014123456002",
+        type_of_security_data="1",
+        security_data="GIWVC5EH7JNT684FVNJ91W2QA4DVN5J8K4F0L0GEQ3DF5TGBN8709HKT5D3DW3"
+        "GBHFCVHMY7J5T6HFR41W2QA4DVN5J8K4F0L0GE",
+    )
+
+
+def passes():
+    """Return named sample passes covering the common layouts."""
+    return {
+        "1-leg mandatory": BarcodedBoardingPass(
+            data=BoardingPassData(legs=[_leg()], passenger_name="DESMARAIS/LUC")
+        ),
+        "1-leg full": BarcodedBoardingPass(data=_full_data([_full_leg()])),
+        "4-leg full": BarcodedBoardingPass(
+            data=_full_data(
+                [
+                    _full_leg(),
+                    _full_leg(from_city_airport_code="FRA", to_city_airport_code="NRT"),
+                    _full_leg(from_city_airport_code="NRT", to_city_airport_code="SYD"),
+                    _full_leg(from_city_airport_code="SYD", to_city_airport_code="YUL"),
+                ]
+            )
+        ),
+    }
+
+
+def barcodes():
+    """Return named sample barcode strings."""
+    return {name: encode(bcbp) for name, bcbp in passes().items()}
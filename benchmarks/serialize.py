@@ -0,0 +1,41 @@
+"""Generated serializers against dataclasses.asdict and json.
+
+Run with ``python -m benchmarks.serialize`` from the repository root.
+"""
+import io
+import json
+import timeit
+from dataclasses import asdict
+
+from bcbp import decode, from_json, to_dict, to_json, write_jsonl
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+
+def _asdict_json(bcbp) -> str:
+    return json.dumps(asdict(bcbp), default=lambda value: value.date().isoformat())
+
+
+def main(count: int = 10000):
+    passes = [
+        decode(barcode, REFERENCE_YEAR)
+        for _, barcode in generate(SCENARIOS["mixed"], count)
+    ]
+    documents = [to_json(bcbp) for bcbp in passes]
+
+    cases = {
+        "asdict": lambda: [asdict(bcbp) for bcbp in passes],
+        "to_dict": lambda: [to_dict(bcbp) for bcbp in passes],
+        "to_dict omit None": lambda: [to_dict(bcbp, True) for bcbp in passes],
+        "asdict + json.dumps": lambda: [_asdict_json(bcbp) for bcbp in passes],
+        "to_json": lambda: [to_json(bcbp) for bcbp in passes],
+        "write_jsonl": lambda: write_jsonl(passes, io.StringIO()),
+        "from_json": lambda: [from_json(document) for document in documents],
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=3))
+        print(f"{name:<20} {count / seconds:9.0f} passes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""SignatureVerifier key and result caches on a lane stream with re-scans.
+
+Run with ``python -m benchmarks.signature`` from the repository root.
+"""
+import hashlib
+import os
+import random
+import timeit
+
+from bcbp import HMACBackend, SignatureVerifier, encode
+from bcbp.signature import signed_parts
+
+from .corpus import SCENARIOS, generate
+
+
+class _PublicKeyLikeBackend(HMACBackend):
+    """HMAC padded to roughly the key parse and verify costs of ECDSA."""
+
+    def load_key(self, material):
+        key = super().load_key(material)
+        return hashlib.pbkdf2_hmac("sha256", key, b"bcbp", 200)
+
+    def verify(self, key, payload, signature):
+        hashlib.pbkdf2_hmac("sha256", key, b"bcbp", 40)
+        return super().verify(key, payload, signature)
+
+
+def _signed_barcodes(count: int, backend: HMACBackend):
+    keys = {}
+    loaded = {}
+    barcodes = []
+    for bcbp, _ in generate(SCENARIOS["1-leg full"], count):
+        data = bcbp.data
+        data.type_of_security_data = data.security_data = None
+        bcbp.meta.beginning_of_security_data = None
+        payload = signed_parts(encode(bcbp)).payload
+        issuer = data.airline_designator_of_boarding_pass_issuer
+        if issuer not in keys:
+            keys[issuer] = f"key-{issuer}"
+            loaded[issuer] = backend.load_key(keys[issuer])
+        data.type_of_security_data = "1"
+        data.security_data = backend.sign(loaded[issuer], payload)
+        bcbp.meta.beginning_of_security_data = "^"
+        barcodes.append(encode(bcbp))
+    return keys, barcodes
+
+
+def main(count: int = 20000, rescans: float = 0.3):
+    backend = _PublicKeyLikeBackend()
+    keys, barcodes = _signed_barcodes(count, backend)
+    rng = random.Random(0)
+    # a lane stream where a share of scans repeat an earlier pass
+    stream = [
+        rng.choice(barcodes[:index]) if index and rng.random() < rescans else barcode
+        for index, barcode in enumerate(barcodes)
+    ]
+
+    for name, options, batch in (
+        ("no caches", dict(max_keys=0, max_results=0), 1),
+        ("key cache", dict(max_results=0), 1),
+        ("key and result caches", {}, 1),
+        ("batches of 256 on 4 threads", {}, 256),
+    ):
+
+        def run():
+            verifier = SignatureVerifier(keys, backend, **options)
+            if batch == 1:
+                # one scan at a time, as a lane sees them
+                return [verifier.verify(barcode) for barcode in stream]
+            results = []
+            for start in range(0, len(stream), batch):
+                chunk = stream[start : start + batch]
+                results += verifier.verify_many(chunk, workers=4)
+            return results
+
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        assert all(run())
+        print(f"{name:<34} {count / seconds:9.0f} scans/s")
+    print(f"({os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Throughput and latency of the asyncio stream decoder over loopback TCP.
+
+Several client connections stand in for scanner lanes and send records to a
+local start_server at the same time: first as fast as they can, to measure
+throughput, then paced in bursts, to measure latency below saturation. Run
+with ``python -m benchmarks.stream`` from the repository root.
+"""
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from bcbp.stream import LENGTH, LENGTH_PREFIX, NEWLINE, start_server
+
+from .corpus import REFERENCE_YEAR, SCENARIOS, generate
+
+BURST = 32
+
+
+def _frame(barcode: str, framing: str) -> bytes:
+    record = barcode.encode("latin-1")
+    if framing == LENGTH:
+        return LENGTH_PREFIX.pack(len(record)) + record
+    return record + b"\n"
+
+
+def _key(bcbp) -> tuple:
+    return bcbp.data.passenger_name, bcbp.data.legs[0].operating_carrier_pnr_code
+
+
+async def _run(
+    corpus, connections: int, framing: str, executor, rate: Optional[float]
+) -> dict:
+    """Send the corpus split across connections; rate is records/s per lane."""
+    sent = {}
+    latencies = []
+
+    def on_result(result):
+        if result.error is not None:
+            raise result.error
+        latencies.append(time.perf_counter() - sent[_key(result.bcbp)])
+
+    server = await start_server(
+        on_result, framing=framing, reference_year=REFERENCE_YEAR, executor=executor
+    )
+    port = server.sockets[0].getsockname()[1]
+
+    async def lane(pairs):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for start in range(0, len(pairs), BURST):
+            now = time.perf_counter()
+            for bcbp, barcode in pairs[start : start + BURST]:
+                sent[_key(bcbp)] = now
+                writer.write(_frame(barcode, framing))
+            await writer.drain()
+            if rate is not None:
+                await asyncio.sleep(BURST / rate)
+        writer.write_eof()
+        # the server closes the connection once every record is decoded
+        await reader.read()
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(lane(corpus[i::connections]) for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+
+    assert len(latencies) == len(corpus)
+    latencies.sort()
+    return {
+        "records_per_sec": len(corpus) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
+
+
+def main(count: int = 8000, connections: int = 8, rate: float = 1000):
+    corpus = generate(SCENARIOS["mixed"], count)
+    # the synthetic corpus may repeat a name and PNR; keep one of each
+    corpus = list({_key(bcbp): (bcbp, barcode) for bcbp, barcode in corpus}.values())
+    # forked workers would inherit and hold open the lanes' connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        for framing in (NEWLINE, LENGTH):
+            for label, executor in (("in loop", None), ("executor", pool)):
+                for load, lane_rate in (("saturated", None), ("paced", rate)):
+                    m = asyncio.run(
+                        _run(corpus, connections, framing, executor, lane_rate)
+                    )
+                    print(
+                        f"{framing:<8} {label:<9} {load:<9}"
+                        f"  {m['records_per_sec']:8.0f} records/s"
+                        f"  p50 {m['p50_ms']:8.2f} ms  p99 {m['p99_ms']:8.2f} ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
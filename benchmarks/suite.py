@@ -0,0 +1,146 @@
+"""Decode/encode benchmark suite over the seeded synthetic corpus.
+
+Reports throughput, per-call latency percentiles and peak traced memory for
+every scenario. Save a baseline on a known-good tree, then check later runs
+against it on the same machine:
+
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --check benchmarks/baseline.json
+
+The check exits with status 1 if throughput drops or peak memory grows by
+more than the tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from bcbp import decode, encode
+
+from .corpus import REFERENCE_YEAR, corpus
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _measure(func: Callable, items: list, repeat: int) -> Dict[str, float]:
+    # throughput from tight loops, best of repeat
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+
+    latencies = []
+    clock = time.perf_counter_ns
+    for item in items:
+        start = clock()
+        func(item)
+        latencies.append(clock() - start)
+    latencies.sort()
+
+    # kept results, so the peak covers what a batch of calls retains
+    tracemalloc.start()
+    results = [func(item) for item in items]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+
+    return {
+        "ops_per_sec": len(items) / best,
+        "p50_us": _percentile(latencies, 0.50) / 1e3,
+        "p90_us": _percentile(latencies, 0.90) / 1e3,
+        "p99_us": _percentile(latencies, 0.99) / 1e3,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run(count: int = 2000, seed: int = 0, repeat: int = 3, names=None) -> dict:
+    """Return {scenario: {"decode": metrics, "encode": metrics}}."""
+    results = {}
+    for name, pairs in corpus(count, seed, names).items():
+        passes = [bcbp for bcbp, _ in pairs]
+        barcodes = [barcode for _, barcode in pairs]
+        results[name] = {
+            "decode": _measure(
+                lambda barcode: decode(barcode, REFERENCE_YEAR), barcodes, repeat
+            ),
+            "encode": _measure(encode, passes, repeat),
+        }
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Describe every metric that got worse than baseline by more than tolerance."""
+    found = []
+    for name, operations in results.items():
+        for operation, metrics in operations.items():
+            before = baseline.get(name, {}).get(operation)
+            if before is None:
+                continue
+            label = f"{name} {operation}"
+            if metrics["ops_per_sec"] < before["ops_per_sec"] * (1 - tolerance):
+                found.append(
+                    f"{label}: {metrics['ops_per_sec']:.0f} ops/s"
+                    f" (baseline {before['ops_per_sec']:.0f})"
+                )
+            if metrics["peak_kib"] > before["peak_kib"] * (1 + tolerance):
+                found.append(
+                    f"{label}: peak {metrics['peak_kib']:.0f} KiB"
+                    f" (baseline {before['peak_kib']:.0f})"
+                )
+    return found
+
+
+def _report(results: dict):
+    for name, operations in results.items():
+        for operation, m in operations.items():
+            print(
+                f"{name:<16} {operation}  {m['ops_per_sec']:9.0f} ops/s"
+                f"  p50 {m['p50_us']:6.2f} us  p90 {m['p90_us']:6.2f} us"
+                f"  p99 {m['p99_us']:6.2f} us  peak {m['peak_kib']:8.0f} KiB"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="passes per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", action="append", help="limit to scenario")
+    parser.add_argument("--save", metavar="PATH", help="write results as baseline")
+    parser.add_argument("--check", metavar="PATH", help="compare against baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.seed, args.repeat, args.scenario)
+    _report(results)
+    settings = {"count": args.count, "seed": args.seed}
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"settings": settings, "results": results}, file, indent=2)
+        print(f"baseline saved to {args.save}")
+
+    if args.check:
+        with open(args.check) as file:
+            baseline = json.load(file)
+        if baseline["settings"] != settings:
+            print(f"baseline was taken with {baseline['settings']}", file=sys.stderr)
+            return 2
+        found = regressions(results, baseline["results"], args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Compare validate against a full decode, on valid and junk input.
+
+Run with ``python -m benchmarks.validate`` from the repository root.
+"""
+import timeit
+
+from bcbp import decode, validate
+
+from .samples import barcodes
+
+
+def _best(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3))
+
+
+def _decode(barcode: str):
+    try:
+        return decode(barcode, 2024)
+    except Exception:
+        return None
+
+
+def main(number: int = 20000):
+    samples = dict(barcodes())
+    samples["junk url"] = "https://example.com/checkin?id=12345"
+    samples["truncated"] = samples["4-leg full"][:150]
+    for name, barcode in samples.items():
+        decoded = _best(lambda: _decode(barcode), number)
+        validated = _best(lambda: validate(barcode), number)
+        print(
+            f"{name:<16} {validate(barcode).code.name:<16}"
+            f" decode {decoded / number * 1e6:7.2f} us"
+            f"  validate {validated / number * 1e6:7.2f} us"
+            f"  speedup {decoded / validated:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()